@@ -0,0 +1,267 @@
+"""Benchmarks for the render, text layout and turn pipelines.
+
+Everything draws to an offscreen surface with SDL's dummy video driver, and
+the model is replaced by StubModel, which answers instantly, so the numbers
+are the game's own overhead. Inputs come from a seeded generator and are the
+same on every run. Results are written as JSON so runs can be compared:
+
+    python3 benchmark.py --output before.json
+    python3 benchmark.py --quick
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+import game
+
+WORDS = ("the evidence suggests that every toaster secretly dreams about bread while cats quietly audit "
+         "our taxes and the internet remembers what you said in 2009 because nothing is ever deleted "
+         "supercalifragilisticexpialidocious arguments need extraordinary proof").split()
+
+
+def make_text(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+class StubModel:
+    """Stands in for OllamaClient and answers every call immediately."""
+
+    def __init__(self, seed=0):
+        self.rng = random.Random(seed)
+        self.cache = None
+
+    def generate(self, prompt, on_token=None, **params):
+        if params.get("format") == "json":
+            text = json.dumps({"statements": [f"Toasters dream of bread {i}" for i in range(5)]})
+        else:
+            text = "That is a compelling point, but I still doubt it. " + make_text(self.rng, 40)
+        if on_token is not None:
+            for word in text.split(" "):
+                on_token(word + " ")
+        return {"response": text, "done": True}
+
+    def close(self):
+        pass
+
+
+def measure(name, params, func, repeat, setup=None):
+    """Time func() repeat times and summarise in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    result = {
+        "name": name,
+        "params": params,
+        "unit": "ms",
+        "n": len(samples),
+        "mean": round(sum(samples) / len(samples), 4),
+        "p50": round(samples[len(samples) // 2], 4),
+        "p95": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 4),
+        "min": round(samples[0], 4),
+        "max": round(samples[-1], 4),
+    }
+    print(f"{name:<18} {json.dumps(params):<40} p50 {result['p50']:9.3f} ms  p95 {result['p95']:9.3f} ms",
+          file=sys.stderr)
+    return result
+
+
+def pump(ai):
+    # Apply worker results the way main() does
+    game_over = False
+    for event in pygame.event.get():
+        if event.type == game.LLM_RESULT_EVENT:
+            game_over = ai.handle_llm_result(event) or game_over
+        elif event.type == game.LLM_TOKEN_EVENT:
+            ai.handle_llm_token(event)
+    return game_over
+
+
+def new_scene():
+    ai = game.AISprite(True)
+    deadline = time.time() + 5
+    while ai.current_scenario is None and time.time() < deadline:
+        pump(ai)
+        time.sleep(0.001)
+    player = game.Player()
+    input_box = game.InputBox(50, game.WINDOW_HEIGHT - 100, game.WINDOW_WIDTH - 300, 80)
+    send_button = game.Button(game.WINDOW_WIDTH - 230, game.WINDOW_HEIGHT - 100, 180, 80, "Send", game.PRIMARY_COLOR)
+    autoplay_button = game.Button(game.WINDOW_WIDTH - 230, game.WINDOW_HEIGHT - 160, 180, 50, "Auto", game.PRIMARY_COLOR)
+    return ai, player, input_box, send_button, autoplay_button
+
+
+def bench_frames(rng, repeat, lengths):
+    results = []
+    for messages in lengths:
+        scene = new_scene()
+        ai = scene[0]
+        for i in range(messages):
+            speaker = "Player" if i % 2 else "AI"
+            ai.conversation_area.add_line(f"{speaker}: {make_text(rng, rng.randint(5, 60))}")
+
+        def full_frame():
+            game.draw_scene(*scene, False)
+
+        results.append(measure("frame_full", {"messages": messages}, full_frame, repeat))
+
+        area = ai.conversation_area
+        positions = [rng.randint(0, max(0, area.total_height - area.height)) for _ in range(repeat)]
+
+        def scroll_frame():
+            area.scroll_position = positions.pop()
+            area.update_scrollbar()
+            game.draw_scene(*scene, False)
+
+        results.append(measure("frame_scroll", {"messages": messages}, scroll_frame, repeat))
+    return results
+
+
+def bench_wrap(rng, repeat, sizes):
+    results = []
+    width = game.WINDOW_WIDTH - 400 - 20 - 2 * game.PADDING
+    for words in sizes:
+        text = make_text(rng, words)
+
+        def cold():
+            game.word_widths.clear()
+            game.wrap_text(text, game.font, width)
+
+        results.append(measure("wrap_cold", {"words": words}, cold, repeat))
+        results.append(measure("wrap_warm", {"words": words}, lambda: game.wrap_text(text, game.font, width), repeat))
+    return results
+
+
+def bench_input(rng, repeat, sizes):
+    results = []
+    for words in sizes:
+        paste = make_text(rng, words)
+
+        def paste_setup():
+            box = game.InputBox(50, game.WINDOW_HEIGHT - 100, game.WINDOW_WIDTH - 300, 80)
+            box.active = True
+            return box
+
+        results.append(measure("input_paste", {"words": words},
+                               lambda box: box.replace_text(0, 0, paste), max(3, repeat // 10), paste_setup))
+
+        box = paste_setup()
+        box.replace_text(0, 0, paste)
+        positions = [rng.randint(0, len(box.text)) for _ in range(repeat)]
+        keys = [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_a, mod=0, unicode=rng.choice("abc "))
+                for _ in range(repeat)]
+
+        def keystroke():
+            # One typed character: edit, incremental reflow and redraw of the box
+            box.cursor_pos = min(positions.pop(), len(box.text))
+            box.handle_event(keys.pop())
+            box.draw(game.screen)
+
+        results.append(measure("input_keystroke", {"words": words}, keystroke, repeat))
+    return results
+
+
+def bench_turns(rng, repeat):
+    results = []
+    for stream in (False, True):
+        game.STREAM_RESPONSES = stream
+        scene = new_scene()
+        ai = scene[0]
+        arguments = [make_text(rng, rng.randint(10, 80)) for _ in range(repeat)]
+
+        def turn():
+            # Player message to reply on screen, including prompt building and worker hand-off
+            if ai.response_count >= ai.MAX_RESPONSES - 1:
+                ai.response_count = 0
+            ai.get_ai_response(arguments.pop())
+            game.draw_scene(*scene, False)
+            while ai.thinking:
+                pump(ai)
+                game.draw_scene(*scene, False)
+
+        results.append(measure("turn", {"stream": stream}, turn, repeat))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark rendering, layout and turn handling.")
+    parser.add_argument("--repeat", type=int, default=200, help="samples per benchmark")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--quick", action="store_true", help="fewer samples and smaller inputs")
+    parser.add_argument("--output", help="write results to this file instead of stdout")
+    args = parser.parse_args()
+    output = os.path.abspath(args.output) if args.output else None
+
+    repeat = 30 if args.quick else args.repeat
+    lengths = (10, 100) if args.quick else (10, 100, 1000)
+    sizes = (100, 1000) if args.quick else (100, 1000, 5000)
+
+    # stdout is kept for the results
+    with contextlib.redirect_stdout(sys.stderr):
+        game.init()
+    # init() built a real client with its metrics file open
+    game.ollama.close()
+    game.ollama = StubModel(args.seed)
+    game.screen = pygame.Surface((game.WINDOW_WIDTH, game.WINDOW_HEIGHT)).convert()
+    # Autosave logs from the benchmark games go to a throwaway directory
+    workdir = tempfile.mkdtemp(prefix="convince-bench-")
+    os.chdir(workdir)
+
+    try:
+        # The game's debug output would mix with the JSON on stdout
+        with contextlib.redirect_stdout(sys.stderr):
+            results = []
+            results += bench_frames(random.Random(args.seed), repeat, lengths)
+            results += bench_wrap(random.Random(args.seed), repeat, sizes)
+            results += bench_input(random.Random(args.seed), repeat, sizes)
+            results += bench_turns(random.Random(args.seed), max(5, repeat // 4))
+    finally:
+        game.conversation_log.close()
+        game.llm_worker.shutdown()
+        game.scenario_queue.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": commit,
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "sdl": ".".join(map(str, pygame.get_sdl_version())),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+import json
+import os
+import queue
+import sys
+import threading
+
+
+class ConversationLog:
+    """Append-only JSON Lines log of game events, written off the main thread.
+
+    log() only puts the event on a queue. A background thread takes whatever
+    has queued up, appends one line per event, then flushes and fsyncs before
+    waiting again, so a crash loses at most the batch being written and never
+    leaves anything but a torn last line (which read_events skips). When a
+    game logs an "end" event, and for any unfinished game on close(), the
+    plain-text transcript is rebuilt from the log next to it.
+    """
+
+    def __init__(self, max_batch=64):
+        self.max_batch = max_batch
+        self.queue = queue.SimpleQueue()
+        self.unfinished = set()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def log(self, path, event):
+        # The writer thread starts with the first event
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="conversation-log", daemon=True)
+                self.thread.start()
+        self.queue.put((path, event))
+
+    def close(self):
+        with self.lock:
+            if self.thread is None:
+                return
+        self.queue.put(None)
+        self.thread.join()
+
+    def run(self):
+        while True:
+            batch = [self.queue.get()]
+            while batch[-1] is not None and len(batch) < self.max_batch:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            closing = batch[-1] is None
+            if closing:
+                batch.pop()
+            self.write(batch)
+            if closing:
+                for path in self.unfinished:
+                    write_transcript(path)
+                return
+
+    def write(self, batch):
+        by_path = {}
+        for path, event in batch:
+            by_path.setdefault(path, []).append(event)
+
+        for path, events in by_path.items():
+            try:
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events))
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                print(f"Autosave failed: {str(e)}")
+                continue
+
+            if any(event.get("event") == "end" for event in events):
+                self.unfinished.discard(path)
+                write_transcript(path)
+            else:
+                self.unfinished.add(path)
+
+
+def read_events(path):
+    events = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                break  # Torn write at the end of the log
+    return events
+
+
+def render_transcript(events):
+    """Format logged events as the human-readable autosave transcript."""
+    state = {}
+    messages = []
+    for event in events:
+        if event.get("event") == "message":
+            messages.append(event)
+        state.update({k: v for k, v in event.items() if k in ("scenario", "goal", "conviction", "responses_left")})
+
+    lines = [
+        f"Scenario: {state.get('scenario')}",
+        f"Goal: Convince AI that this is {state.get('goal')}",
+        f"Current Conviction: {state.get('conviction')}%",
+        f"Responses remaining: {state.get('responses_left')}",
+        "",
+        "Conversation:",
+        "-" * 50,
+    ]
+    # Each exchange ends with the AI's reply
+    for message in messages:
+        lines.append(f"{message['speaker']}: {message['text']}")
+        if message["role"] == "ai":
+            lines.append("-" * 50)
+    return "\n".join(lines) + "\n"
+
+
+def write_transcript(path):
+    # The transcript sits next to its log with a .txt extension
+    try:
+        with open(os.path.splitext(path)[0] + ".txt", "w", encoding="utf-8") as f:
+            f.write(render_transcript(read_events(path)))
+    except OSError as e:
+        print(f"Autosave failed: {str(e)}")
+
+
+if __name__ == "__main__":
+    # Rebuild transcripts by hand, e.g. after a crash: python conversation_log.py conversations/*.jsonl
+    for log_path in sys.argv[1:]:
+        write_transcript(log_path)
@@ -0,0 +1,535 @@
+import json
+import os
+import random
+import threading
+
+from scorer import scorer
+
+
+# What makes a good scenario; shared by the single and batched scenario prompts
+SCENARIO_CRITERIA = """1. A clear declarative statement (not a question)
+2. Something that could be argued as true or false
+3. Combines everyday things with bigger concepts
+4. Has a touch of humor while being debatable
+5. Could have interesting evidence on both sides
+
+Examples of good statements:
+- "Cats possess an innate understanding of quantum physics"
+- "Procrastination is actually a form of time travel"
+- "Pizza tastes better because it believes in you"
+- "Houseplants secretly judge our life choices"
+- "Parallel universes are created by lost socks in the dryer"
+- "The internet experiences emotions just like humans do"
+- "Smartphones intentionally die at dramatic moments"
+- "Dreams are bug reports from the simulation we live in"
+
+Rules:
+- Must be a STATEMENT, not a question
+- Should be debatable but not absurd
+- Mix mundane objects with profound concepts
+- Keep it relatable but intriguing
+- Make it fun but arguable"""
+
+# Scenarios requested per batched call; 1 turns batching off
+SCENARIO_BATCH_SIZE = int(os.getenv("SCENARIO_BATCH_SIZE", "5"))
+
+# Continue each debate in the model's context instead of resending the history every turn
+CONTEXT_REUSE = os.getenv("OLLAMA_CONTEXT_REUSE", "true").lower() in ("1", "true", "yes")
+# The model's context window in tokens; a debate is summarized once it fills three quarters of it
+CONTEXT_TOKENS = int(os.getenv("OLLAMA_CONTEXT_TOKENS", "2048"))
+
+
+def clean_scenario(text):
+    """Apply the scenario post-processing rules. Returns None if the result is too short to use."""
+    scenario = text.strip().strip('"')
+
+    # Clean up any common formatting issues
+    scenario = scenario.replace("The statement: ", "").replace("Scenario: ", "").strip()
+
+    # Convert questions to statements if needed
+    if scenario.endswith("?"):
+        scenario = scenario[:-1] + "."
+    if scenario.lower().startswith("what if "):
+        scenario = scenario[8:].capitalize()
+    if scenario.lower().startswith("why do "):
+        scenario = scenario[7:].capitalize() + " because of cosmic laws."
+
+    return scenario if len(scenario) >= 10 else None
+
+
+def generate_scenario(client):
+    try:
+        # First attempt with entertaining but thought-provoking prompt
+        response = client.generate(
+            f"""Generate ONE entertaining but thought-provoking statement for debate. The statement should be:
+{SCENARIO_CRITERIA}
+
+Generate ONE entertaining statement. Return ONLY the statement, nothing else.""",
+            purpose="scenario"
+        )
+
+        scenario = clean_scenario(response['response'])
+
+        # If the response is empty or too short, try a second prompt
+        if scenario is None:
+            response = client.generate(
+                """Create ONE amusing debate statement about:
+- Everyday objects having secret lives
+- Technology having hidden wisdom
+- Food having metaphysical properties
+- Pets having cosmic knowledge
+- Time having personal preferences
+- Common annoyances having deeper meaning
+
+Make it a clear declarative statement (not a question).
+Return ONLY the statement.""",
+                purpose="scenario"
+            )
+            scenario = clean_scenario(response['response'])
+
+        # If still empty or too short, generate a procedural scenario
+        if scenario is None:
+            # Generate a procedural scenario using entertaining templates
+            subjects = [
+                "Your coffee maker",
+                "The internet",
+                "Traffic lights",
+                "Your bed",
+                "Social media",
+                "The refrigerator",
+                "Your favorite song",
+                "The weekend",
+                "Your computer",
+                "The weather"
+            ]
+            verbs = [
+                "possesses the wisdom of",
+                "secretly controls",
+                "understands",
+                "manipulates",
+                "communicates with",
+                "influences",
+                "philosophically aligns with",
+                "channels the energy of",
+                "transcends",
+                "bends"
+            ]
+            effects = [
+                "ancient cosmic knowledge",
+                "the space-time continuum",
+                "quantum mathematics",
+                "parallel dimensions",
+                "universal consciousness",
+                "metaphysical reality",
+                "the laws of physics",
+                "human motivation",
+                "cosmic harmony",
+                "the collective unconscious"
+            ]
+
+            scenario = f"{random.choice(subjects)} {random.choice(verbs)} {random.choice(effects)}"
+
+        print(f"Generated scenario: {scenario}")  # Debug logging
+        return scenario
+
+    except Exception as e:
+        print(f"Error generating scenario: {str(e)}")  # Debug logging
+        return fallback_scenario()
+
+
+def fallback_scenario():
+    """A ready-made scenario for when the model cannot be reached."""
+    topics = [
+        "Smartphones possess emotional intelligence",
+        "Vegetables experience philosophical enlightenment",
+        "The internet has achieved consciousness",
+        "Cars develop personalities based on their owners",
+        "Mirrors reflect alternate realities",
+        "Gym equipment conspires for human health",
+        "Calendars manipulate the flow of time",
+        "Autocorrect has literary aspirations",
+        "Keys teleport to test human patience",
+        "Clouds are shepherds of cosmic energy"
+    ]
+
+    return random.choice(topics)
+
+
+def generate_scenarios(client, count):
+    """Generate up to count scenarios from a single model call.
+
+    The model returns the statements as JSON and each one goes through
+    clean_scenario, so the long scenario prompt is evaluated once per batch
+    instead of once per game. Falls back to a single generate_scenario() call
+    if the batch comes back unusable.
+    """
+    count = min(count, SCENARIO_BATCH_SIZE)
+    if count <= 1:
+        return [generate_scenario(client)]
+
+    try:
+        response = client.generate(
+            f"""Generate {count} different entertaining but thought-provoking statements for debate. Each statement should be:
+{SCENARIO_CRITERIA}
+
+Return ONLY a JSON object of the form {{"statements": ["first statement", "second statement"]}} with exactly {count} statements.""",
+            format="json",
+            purpose="scenario"
+        )
+        statements = json.loads(response['response']).get("statements", [])
+
+        scenarios = []
+        for statement in statements:
+            if not isinstance(statement, str):
+                continue
+            scenario = clean_scenario(statement)
+            if scenario is not None and scenario not in scenarios:
+                scenarios.append(scenario)
+
+        if scenarios:
+            print(f"Generated {len(scenarios)} scenarios in one batch")  # Debug logging
+            return scenarios[:count]
+    except Exception as e:
+        print(f"Error generating scenario batch: {str(e)}")  # Debug logging
+
+    return [generate_scenario(client)]
+
+
+class Debate:
+    """State and rules of one debate, with no pygame or threading involved.
+
+    The windowed game's AISprite builds on this, and simulate.py drives it
+    directly. Model calls are left to the caller: automated_prompt() and
+    begin_turn() return what to send, and apply_reply() scores what came back.
+    """
+
+    MAX_RESPONSES = 10
+
+    def __init__(self, convince_true):
+        self.convince_true = convince_true
+        self.new_game()
+
+    def new_game(self):
+        self.conviction = 0 if self.convince_true else 100
+        self.current_scenario = None
+        self.response = "Convince me!" if self.convince_true else "I believe this is true. Prove me wrong!"
+        self.conversation_history = []
+        self.complete_history = []
+        self.response_count = 0
+        self.session = ReplySession() if CONTEXT_REUSE else None
+
+    @property
+    def responses_left(self):
+        return self.MAX_RESPONSES - self.response_count
+
+    @property
+    def won(self):
+        return (self.convince_true and self.conviction >= 100) or (not self.convince_true and self.conviction <= 0)
+
+    def automated_prompt(self):
+        # Format conversation history
+        history_text = "\n".join(self.conversation_history[-6:] if self.conversation_history else [])
+
+        # Create a prompt for the player AI
+        return f"""You are an AI debater trying to convince another AI about a scenario. Be persuasive and use logical arguments.
+
+🎯 Current scenario: "{self.current_scenario}"
+💬 Your goal: Convince the AI that this is {'TRUE' if self.convince_true else 'FALSE'}
+⚡ Responses left: {self.MAX_RESPONSES - self.response_count}
+
+Previous conversation:
+{history_text}
+
+🔥 Response Guidelines:
+- Use compelling evidence and logical arguments
+- Be concise but persuasive
+- {'Present evidence and logical proofs to support the truth' if self.convince_true else 'Present evidence and logical arguments to disprove this'}
+- Adapt your strategy based on the AI\'s previous responses
+- For false claims, focus on debunking with facts
+- For true claims, focus on providing supporting evidence
+
+{f'🚨 Getting urgent now - only {self.MAX_RESPONSES - self.response_count} chances left to make your point!' if self.MAX_RESPONSES - self.response_count <= 3 else ''}
+
+Your response (write a natural, human-like message):"""
+
+    def fallback_automated_response(self):
+        """Canned auto-player argument for when the model call failed; nudges conviction its way."""
+        if self.convince_true:
+            responses = [
+                "Look, I've seen this with my own eyes!",
+                "Let me tell you about my personal experience with this.",
+                "I know this sounds crazy, but hear me out...",
+                "Trust me, I've done a lot of research on this.",
+                "I can show you proof right now.",
+                "This happened to me personally.",
+                "I was skeptical too until I learned about this.",
+                "Think about it logically for a second.",
+                "Let me explain why this makes sense.",
+                "I totally understand your doubt, but..."
+            ]
+            self.conviction = min(100, self.conviction + 15)
+        else:
+            responses = [
+                "Wait, that's not right at all!",
+                "I used to believe that too, but then I learned...",
+                "That's a common mistake, let me explain why.",
+                "I know for a fact this isn't true because...",
+                "Trust me, I've looked into this extensively.",
+                "That's just an old myth people keep spreading.",
+                "I thought the same thing until I found out...",
+                "Let me show you why this doesn't make sense.",
+                "I understand why you'd think that, but...",
+                "That's actually been proven wrong many times."
+            ]
+            self.conviction = max(0, self.conviction - 15)
+        return random.choice(responses)
+
+    def ending(self):
+        """Pick the AI's closing line once all responses are used up."""
+        # More varied end-game responses
+        if self.convince_true:
+            if self.conviction >= 70:
+                endings = [
+                    "You've done it! Your compelling evidence and logical reasoning have won me over. I now see the truth in this.",
+                    "I can't deny it anymore - you've presented such strong arguments that I'm fully convinced now.",
+                    "What a revelation! Your evidence has completely changed my perspective. I believe you're right.",
+                    "Remarkable! You've successfully shown me the truth. Your arguments were absolutely convincing."
+                ]
+            else:
+                endings = [
+                    "Time's up! While you raised some interesting points, I'm still not convinced by the evidence.",
+                    "Nice try, but your arguments weren't quite strong enough to change my mind on this.",
+                    "I appreciate the effort, but I remain skeptical. The evidence just wasn't compelling enough.",
+                    "We're done here, and I'm still not seeing enough proof to believe this claim."
+                ]
+        else:
+            if self.conviction <= 30:
+                endings = [
+                    "You've successfully debunked this! Your evidence has thoroughly disproven my initial belief.",
+                    "I stand corrected! Your arguments have completely dismantled my previous position.",
+                    "I was wrong - you've shown me clear evidence that this isn't true at all.",
+                    "You've convinced me completely. The evidence against this is overwhelming."
+                ]
+            else:
+                endings = [
+                    "Time's up! Your arguments weren't enough to shake my conviction in this.",
+                    "I've heard your points, but I still believe this is true. You haven't provided enough evidence.",
+                    "Sorry, but I remain convinced. Your arguments didn't effectively counter the evidence.",
+                    "We're done, and I still stand by my initial position. The counter-arguments weren't strong enough."
+                ]
+        self.response = random.choice(endings)
+        self.complete_history.append(f"AI: {self.response}")
+        return self.response
+
+    def begin_turn(self, player_input):
+        """Record the player's message and return the arguments for generate_reply."""
+        self.response_count += 1
+        self.conversation_history.append(f"Player: {player_input}")
+        self.complete_history.append(f"Player: {player_input}")
+
+        # Keep only last 6 exchanges for context
+        history_pairs = []
+        for i in range(0, len(self.conversation_history)-1, 2):
+            if i+1 < len(self.conversation_history):
+                history_pairs.append((self.conversation_history[i], self.conversation_history[i+1]))
+        history_pairs = history_pairs[-3:]  # Keep last 3 exchanges
+
+        # Format conversation history for AI context
+        history_text = ""
+        for player_msg, ai_msg in history_pairs:
+            history_text += f"{player_msg}\n{ai_msg}\n\n"
+        history_text += f"Player: {player_input}\n"  # Add current input
+
+        # Calculate response style based on conviction and responses left
+        responses_left = self.MAX_RESPONSES - self.response_count
+        conviction_level = "high" if self.conviction > 70 else "low" if self.conviction < 30 else "medium"
+
+        # Generate dynamic personality traits based on game state
+        personality_traits = []
+        if self.convince_true:
+            if conviction_level == "low":
+                personality_traits = ["deeply skeptical", "requires solid evidence", "analytically minded"]
+            elif conviction_level == "medium":
+                personality_traits = ["cautiously interested", "open to new ideas", "thoughtfully considering"]
+            else:
+                personality_traits = ["nearly convinced", "excited by the evidence", "eager to understand more"]
+        else:
+            if conviction_level == "high":
+                personality_traits = ["strongly convinced", "confident in their belief", "seeking to understand opposing views"]
+            elif conviction_level == "medium":
+                personality_traits = ["starting to question", "weighing both sides", "carefully analyzing"]
+            else:
+                personality_traits = ["doubting their position", "reconsidering the evidence", "open to being wrong"]
+
+        return (self.current_scenario, self.convince_true, player_input, history_text,
+                random.choice(personality_traits), conviction_level, responses_left)
+
+    def apply_reply(self, response_text):
+        """Record the AI's reply and move conviction. Returns True when the debate is decided."""
+        self.response = response_text
+        self.conversation_history.append(f"AI: {response_text}")
+        self.complete_history.append(f"AI: {response_text}")
+
+        # Update conviction based on response content and current state
+        conviction_change = scorer.change(response_text, self.convince_true)
+
+        # Apply conviction change with momentum and context
+        responses_left = self.MAX_RESPONSES - self.response_count
+        if self.convince_true:
+            if self.conviction > 50:  # Already leaning towards convinced
+                conviction_change *= 1.5
+            elif responses_left <= 3:  # Near the end
+                conviction_change *= 1.2
+            self.conviction = min(100, max(0, self.conviction + conviction_change))
+        else:
+            if self.conviction < 50:  # Already leaning towards doubt
+                conviction_change *= 1.5
+            elif responses_left <= 3:  # Near the end
+                conviction_change *= 1.2
+            self.conviction = min(100, max(0, self.conviction + conviction_change))
+
+        # Force a decision on the last response if appropriate
+        if responses_left <= 1:
+            if self.convince_true and self.conviction >= 70:
+                self.conviction = 100
+                return True
+            elif not self.convince_true and self.conviction <= 30:
+                self.conviction = 0
+                return True
+
+        return False
+
+
+class ReplySession:
+    """Keeps the AI opponent's side of one debate in the model's context.
+
+    The first reply sends the full instructions; Ollama returns the evaluated
+    conversation as a "context" array, and each later turn sends only the new
+    player message and state along with it, so the model skips re-reading the
+    instructions and history. Once the context passes three quarters of
+    max_tokens the debate so far is summarized and the next turn starts a fresh
+    context from the instructions plus that summary. The summary runs on its
+    own thread once the reply is returned, so it overlaps the player's next
+    message and key-points call instead of delaying the reply. max_tokens is
+    sent as num_ctx, so the server's window is the one being budgeted. Used by
+    one turn at a time; a new game gets a new session.
+    """
+
+    def __init__(self, max_tokens=None):
+        self.max_tokens = max_tokens or CONTEXT_TOKENS
+        self.context = None
+        self.summary = None
+        self.summarizing = None  # Thread writing the summary, joined by the next reply
+
+    def reply(self, client, scenario, convince_true, player_input, history_text, personality, conviction_level,
+              responses_left, key_points, on_token=None):
+        if self.summarizing is not None:
+            self.summarizing.join()
+            self.summarizing = None
+
+        options = {"num_ctx": self.max_tokens}
+        if self.context is None:
+            # Fresh context: the full prompt, with the summary of anything dropped
+            prompt = reply_prompt(scenario, convince_true, history_text, personality, conviction_level,
+                                  responses_left, key_points, self.summary)
+            result = client.generate(prompt, on_token=on_token, purpose="reply", options=options)
+        else:
+            prompt = followup_prompt(player_input, personality, conviction_level, responses_left, key_points)
+            result = client.generate(prompt, on_token=on_token, purpose="reply", options=options,
+                                     context=self.context)
+
+        # Without a context back (e.g. an old cache entry) the next turn starts fresh
+        self.context = result.get("context") or None
+        if self.context and len(self.context) > self.max_tokens * 3 // 4:
+            self.summarizing = threading.Thread(target=self.summarize, args=(client,), name="debate-summary",
+                                                daemon=True)
+            self.summarizing.start()
+        return result['response']
+
+    def summarize(self, client):
+        try:
+            result = client.generate(SUMMARY_PROMPT, purpose="summary", options={"num_ctx": self.max_tokens},
+                                     context=self.context)
+            self.summary = result['response'].strip()
+        except Exception as e:
+            # The history in the next full prompt still covers the last few exchanges
+            print(f"Error summarizing debate: {str(e)}")  # Debug logging
+        self.context = None
+
+
+SUMMARY_PROMPT = """Summarize the debate so far in under 100 words: the player's main arguments, which ones \
+you found convincing or not, and how your position has shifted. Write it as notes to yourself."""
+
+
+def reply_prompt(scenario, convince_true, history_text, personality, conviction_level, responses_left, key_points,
+                 summary=None):
+    summary_text = f"""
+Summary of the Debate Before That:
+{summary}
+""" if summary else ""
+
+    return f"""You are an AI with a distinct personality in a debate about: "{scenario}"
+
+Your Current State:
+- Personality: {personality}
+- Conviction Level: {conviction_level}
+- Responses Left: {responses_left}
+- Goal: You are {'being convinced this is true' if convince_true else 'being convinced this is false'}
+
+Key Points from Player's Latest Argument:
+{key_points}
+{summary_text}
+Recent Conversation History:
+{history_text}
+
+Response Guidelines:
+1. NEVER use generic phrases like "Hmm" or "Interesting"
+2. ALWAYS address at least one specific point from the player's argument
+3. Base your response on your conviction level:
+   - High conviction: Challenge their evidence firmly but fairly
+   - Medium conviction: Show openness while raising specific concerns
+   - Low conviction: Acknowledge good points while seeking final clarification
+4. Show clear reasoning for why you agree or disagree with their points
+5. If nearing the end ({responses_left} responses left), be more decisive
+6. Keep responses concise but meaningful
+
+Write a natural response that directly addresses their argument:"""
+
+
+def followup_prompt(player_input, personality, conviction_level, responses_left, key_points):
+    # The scenario, goal and guidelines are already in the context
+    return f"""Player: {player_input}
+
+Your Current State:
+- Personality: {personality}
+- Conviction Level: {conviction_level}
+- Responses Left: {responses_left}
+
+Key Points from Player's Latest Argument:
+{key_points}
+
+Follow the same guidelines as before. Write a natural response that directly addresses their argument:"""
+
+
+def generate_reply(client, scenario, convince_true, player_input, history_text, personality, conviction_level,
+                   responses_left, on_token=None, session=None):
+    """Make the key-points and reply calls for one turn and return the AI's reply text.
+
+    Takes the snapshot from Debate.begin_turn so it can run on another thread
+    or process. on_token is passed through to stream the reply. With a
+    ReplySession the reply continues the debate's model context instead of
+    resending the history.
+    """
+    # Extract key points from player's argument
+    key_points_prompt = f"""Extract 2-3 key points from this argument: "{player_input}"
+        Format: Just the points, one per line, no numbers or bullets."""
+
+    key_points = client.generate(key_points_prompt, purpose="key-points")['response'].strip()
+
+    if session is not None:
+        return session.reply(client, scenario, convince_true, player_input, history_text, personality,
+                             conviction_level, responses_left, key_points, on_token)
+
+    prompt = reply_prompt(scenario, convince_true, history_text, personality, conviction_level, responses_left,
+                          key_points)
+    return client.generate(prompt, on_token=on_token, purpose="reply")['response']
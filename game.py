@@ -1,18 +1,29 @@
 import pygame
-import random
-import requests
-import json
 import os
+import json
+import platform
 import math
+import bisect
 import datetime
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
-# Initialize Pygame
-pygame.init()
-
-# Load environment variables
+# Load environment variables; debate reads its settings when it is imported
 load_dotenv()
 
+from ollama_client import OllamaClient
+from conversation_log import ConversationLog
+from debate import Debate, fallback_scenario, generate_scenarios, generate_reply
+
+# Start of the time-to-first-frame measurement
+IMPORTED_AT = time.perf_counter()
+
+# Shared client for every model call, created by init(); configured through OLLAMA_* environment variables
+ollama = None
+
 # Game constants
 WINDOW_WIDTH = 1200
 WINDOW_HEIGHT = 800
@@ -45,53 +56,42 @@ EMOJI_WIN = "✨"
 EMOJI_LOSE = "✖"
 EMOJI_RESTART = "🔄"
 
-# Set up the display
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Convince the AI!")
-
-# Try to load custom fonts, fall back to default if not available
-try:
-    # Try to load system fonts that support emojis
-    font_names = [
-        "Segoe UI Emoji",  # Windows
-        "Apple Color Emoji",  # macOS
-        "Noto Color Emoji",  # Linux
-        "Arial Unicode MS",  # Common fallback
-        "Arial"  # Final fallback
-    ]
-
-    font = None
-    large_font = None
-    small_font = None
-
-    for font_name in font_names:
-        try:
-            font = pygame.font.SysFont(font_name, FONT_SIZE)
-            large_font = pygame.font.SysFont(font_name, LARGE_FONT_SIZE)
-            small_font = pygame.font.SysFont(font_name, SMALL_FONT_SIZE)
-
-            # Test emoji rendering
-            test_text = "🎮🎯💬📝"
-            test_surface = font.render(test_text, True, BLACK)
-            if test_surface.get_width() > 0:  # If emojis rendered successfully
-                break
-        except:
-            continue
-
-    if font is None:
-        font = pygame.font.Font(None, FONT_SIZE)
-        large_font = pygame.font.Font(None, LARGE_FONT_SIZE)
-        small_font = pygame.font.Font(None, SMALL_FONT_SIZE)
-
-except Exception as e:
-    print(f"Font loading error: {str(e)}")
-    font = pygame.font.Font(None, FONT_SIZE)
-    large_font = pygame.font.Font(None, LARGE_FONT_SIZE)
-    small_font = pygame.font.Font(None, SMALL_FONT_SIZE)
-
-# Create fonts directory if it doesn't exist
-if not os.path.exists("assets/fonts"):
-    os.makedirs("assets/fonts")
+# Posted by the LLM worker when a background Ollama call finishes
+LLM_RESULT_EVENT = pygame.USEREVENT + 1
+# Posted by the LLM worker for each token of a streamed AI reply
+LLM_TOKEN_EVENT = pygame.USEREVENT + 2
+
+# Only push changed screen regions to the display instead of flipping every frame
+DIRTY_RECTS = os.getenv("DIRTY_RECTS", "true").lower() in ("1", "true", "yes")
+
+# Slow down to the next scheduled change while nothing animates, instead of running at a fixed 60 fps
+FRAME_PACING = os.getenv("FRAME_PACING", "true").lower() in ("1", "true", "yes")
+ACTIVE_FPS = 60
+# Longest idle frame; also the most an idle loop can delay the first event it sees
+IDLE_FRAME_MS = 50
+# Full frame rate for this long after any event
+INPUT_ACTIVE_MS = 1000
+
+# Stream AI replies token by token instead of waiting for the whole reply
+STREAM_RESPONSES = os.getenv("STREAM_RESPONSES", "true").lower() in ("1", "true", "yes")
+
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+AI_SPRITE_PATH = os.path.join(GAME_DIR, "assets", "sprites", "ai_sprite.png")
+PLAYER_SPRITE_PATH = os.path.join(GAME_DIR, "assets", "sprites", "player_sprite.png")
+
+# Window, fonts and sprites; set up by init() so importing this module has no side effects
+screen = None
+font = None
+large_font = None
+small_font = None
+fonts_render_emoji = False  # Whether the chosen font drew the emoji test string
+ai_sprite = None
+player_sprite = None
+ai_animation = None
+player_animation = None
+
+# Milliseconds spent in each startup stage, reported with the first frame
+startup_times = {}
 
 # Create placeholder sprites if they don't exist
 def create_placeholder_sprites():
@@ -119,7 +119,7 @@ def create_placeholder_sprites():
     pygame.draw.lines(ai_surface, WHITE, False, points, 3)
 
     ai_surface = pygame.transform.scale(ai_surface, (150, 150))
-    pygame.image.save(ai_surface, "assets/sprites/ai_sprite.png")
+    pygame.image.save(ai_surface, AI_SPRITE_PATH)
 
     # Player sprite (modern avatar)
     player_surface = pygame.Surface((150, 150), pygame.SRCALPHA)  # Increased size
@@ -145,52 +145,583 @@ def create_placeholder_sprites():
             pygame.draw.line(player_surface, BLACK, (75, 75), (x, y), 3)
 
     player_surface = pygame.transform.scale(player_surface, (150, 150))
-    pygame.image.save(player_surface, "assets/sprites/player_sprite.png")
+    pygame.image.save(player_surface, PLAYER_SPRITE_PATH)
+
+# Fonts that support emojis, in order of preference
+FONT_NAMES = [
+    "Segoe UI Emoji",  # Windows
+    "Apple Color Emoji",  # macOS
+    "Noto Color Emoji",  # Linux
+    "Arial Unicode MS",  # Common fallback
+    "Arial"  # Final fallback
+]
+
+# Resolved font file, so later launches skip the system font scan
+FONT_CACHE = os.getenv("FONT_CACHE", os.path.join(GAME_DIR, ".cache", "fonts.json"))
+
+def resolve_font():
+    """Find the font file to use. Returns (path, renders_emoji); a None path is pygame's default font."""
+    for font_name in FONT_NAMES:
+        try:
+            # match_font gives the file SysFont would open, or None when SysFont falls back to the default
+            path = pygame.font.match_font(font_name)
 
-# Create placeholder sprites if they don't exist
-if not os.path.exists("assets/sprites/ai_sprite.png"):
-    create_placeholder_sprites()
+            # Test emoji rendering
+            test_text = "🎮🎯💬📝"
+            test_surface = pygame.font.Font(path, FONT_SIZE).render(test_text, True, BLACK)
+            if test_surface.get_width() > 0:  # If emojis rendered successfully
+                return path, True
+        except:
+            continue
+    return None, False
+
+def cached_font():
+    """resolve_font() through the on-disk cache, keyed by platform and FONT_NAMES.
+
+    Only a font file that was found is cached: falling back to pygame's
+    default font is probed again next launch, in case fonts were installed.
+    """
+    key = "|".join([platform.system(), platform.release()] + FONT_NAMES)
+    entries = {}
+    if FONT_CACHE:
+        try:
+            with open(FONT_CACHE, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    entry = entries.get(key)
+    if entry is not None and entry.get("path") and "emoji" in entry and os.path.exists(entry["path"]):
+        return entry["path"], entry["emoji"]
+
+    # Missing, or the font file has gone away since it was cached
+    path, emoji = resolve_font()
+    if FONT_CACHE and path is not None:
+        entries[key] = {"path": path, "emoji": emoji}
+        try:
+            os.makedirs(os.path.dirname(FONT_CACHE) or ".", exist_ok=True)
+            with open(FONT_CACHE + ".tmp", "w", encoding="utf-8") as f:
+                json.dump(entries, f, indent=2)
+            os.replace(FONT_CACHE + ".tmp", FONT_CACHE)
+        except OSError as e:
+            print(f"Could not write font cache: {str(e)}")
+    return path, emoji
+
+def load_fonts():
+    """Load the game fonts. Returns (font, large_font, small_font, renders_emoji)."""
+    try:
+        path, emoji = cached_font()
+        return (pygame.font.Font(path, FONT_SIZE), pygame.font.Font(path, LARGE_FONT_SIZE),
+                pygame.font.Font(path, SMALL_FONT_SIZE), emoji)
+    except Exception as e:
+        print(f"Font loading error: {str(e)}")
+        return (pygame.font.Font(None, FONT_SIZE), pygame.font.Font(None, LARGE_FONT_SIZE),
+                pygame.font.Font(None, SMALL_FONT_SIZE), False)
+
+def load_sprite_images():
+    # Create fonts directory if it doesn't exist
+    os.makedirs(os.path.join(GAME_DIR, "assets", "fonts"), exist_ok=True)
+
+    # Create placeholder sprites if they don't exist
+    if not os.path.exists(AI_SPRITE_PATH):
+        create_placeholder_sprites()
+
+    # Not converted yet; that needs the display
+    return pygame.image.load(AI_SPRITE_PATH), pygame.image.load(PLAYER_SPRITE_PATH)
+
+def timed(stage, func):
+    started = time.perf_counter()
+    result = func()
+    startup_times[stage] = (time.perf_counter() - started) * 1000
+    return result
+
+def init():
+    """Start pygame, open the window and load fonts and sprites. Safe to call more than once.
+
+    Font probing and image loading run on helper threads while the main
+    thread opens the window, since SDL wants the display on the main thread.
+    """
+    global ollama, screen, font, large_font, small_font, fonts_render_emoji, ai_sprite, player_sprite
+    global ai_animation, player_animation
+    if screen is not None:
+        return
+
+    started = time.perf_counter()
+    pygame.init()
+    if ollama is None:
+        ollama = OllamaClient()
+
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup") as pool:
+        fonts = pool.submit(timed, "fonts", load_fonts)
+        sprites = pool.submit(timed, "sprites", load_sprite_images)
+
+        # Set up the display
+        screen = timed("window", lambda: pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT)))
+        pygame.display.set_caption("Convince the AI!")
+
+        font, large_font, small_font, fonts_render_emoji = fonts.result()
+        ai_image, player_image = sprites.result()
+
+    # Load sprites
+    ai_sprite = ai_image.convert_alpha()
+    player_sprite = player_image.convert_alpha()
+
+    # Every size the breathing and thinking pulses can reach, scaled once
+    ai_animation = SpriteAnimation.scaled(ai_sprite, 150, 1.05)
+    player_animation = SpriteAnimation.scaled(player_sprite, 100, 1.02)
+    startup_times["init"] = (time.perf_counter() - started) * 1000
+
+def first_frame_drawn():
+    # Report time to first frame once
+    if "first_frame" in startup_times:
+        return
+    startup_times["first_frame"] = (time.perf_counter() - IMPORTED_AT) * 1000
+    stages = ", ".join(f"{stage} {startup_times[stage]:.0f} ms"
+                       for stage in ("init", "window", "fonts", "sprites") if stage in startup_times)
+    print(f"Startup: first frame {startup_times['first_frame']:.0f} ms after import ({stages})")
+
+class LLMWorker:
+    """Runs blocking Ollama calls off the main thread.
+
+    Each finished call is posted back to the pygame event queue as an
+    LLM_RESULT_EVENT carrying the call's purpose, the game it belongs to and
+    either its result or the exception it raised.
+    """
+
+    def __init__(self, max_workers=2):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm-worker")
+        self.stopped = False
+
+    def submit(self, purpose, game_id, func, *args):
+        if self.stopped:
+            return None
+        future = self.executor.submit(self._run, func, *args)
+        future.add_done_callback(lambda f: self._post_result(purpose, game_id, f))
+        return future
+
+    def _run(self, func, *args):
+        # A call queued behind a running one may start between shutdown() and the cancel
+        if self.stopped:
+            return None
+        return func(*args)
+
+    def _post_result(self, purpose, game_id, future):
+        if future.cancelled() or self.stopped:
+            return
+        error = future.exception()
+        result = None if error else future.result()
+        self.post(LLM_RESULT_EVENT, purpose=purpose, game_id=game_id, result=result, error=error)
+
+    def post(self, event_type, **attrs):
+        # pygame.event.post is safe to call from worker threads
+        try:
+            pygame.event.post(pygame.event.Event(event_type, **attrs))
+        except pygame.error:
+            pass  # Display already shut down
+
+    def shutdown(self):
+        self.stopped = True
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+llm_worker = LLMWorker()
+
+# Autosaves are appended to conversations/*.jsonl on a background thread
+conversation_log = ConversationLog()
+
+class TextRenderCache:
+    """Bounded LRU cache of rendered text surfaces keyed by (font, text, color).
+
+    Most text on screen is unchanged from one frame to the next, so every draw
+    path renders through this cache instead of rasterizing with font.render
+    each frame. Cached surfaces are shared and must not be drawn on.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+
+    def render(self, font, text, color):
+        key = (font, text, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+
+        # Match the display format so every later blit is a plain copy
+        surface = font.render(text, True, color).convert_alpha()
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+text_cache = TextRenderCache()
+
+def render_text(font, text, color):
+    return text_cache.render(font, text, color)
+
+# Transparent color for static layers; never used by the theme
+LAYER_COLORKEY = (255, 0, 255)
 
-# Load sprites
-ai_sprite = pygame.image.load("assets/sprites/ai_sprite.png").convert_alpha()
-player_sprite = pygame.image.load("assets/sprites/player_sprite.png").convert_alpha()
+class LayerCache:
+    """Static scene layers rendered once and blitted every frame.
+
+    A layer is keyed by name, size and any variant arguments, which are also
+    passed to its builder. Window size is part of the key, so a resize builds
+    fresh layers; call invalidate() after changing theme colors.
+    """
+
+    def __init__(self):
+        self.layers = {}
+
+    def get(self, name, size, build, *variant):
+        key = (name, size) + variant
+        layer = self.layers.get(key)
+        if layer is None:
+            layer = build(size, *variant)
+            self.layers[key] = layer
+        return layer
+
+    def invalidate(self):
+        self.layers.clear()
+
+layers = LayerCache()
+
+class SpriteAnimation:
+    """Frames of one sprite rendered up front, so drawing is a single blit.
+
+    scaled() builds one frame per whole-pixel size of a pulsing sprite, so
+    nearest() can stand in for a per-frame transform.scale. from_sheet()
+    cuts a sprite sheet into frames for assets that animate by image, which
+    frame() then cycles through. Frames are shared and must not be drawn on.
+    """
+
+    def __init__(self, frames, sizes=None):
+        self.frames = frames
+        self.sizes = sizes
+
+    @classmethod
+    def scaled(cls, image, base_size, max_scale):
+        # Sizes are whole pixels, so this is every distinct frame the pulse can show
+        sizes = list(range(base_size, int(base_size * max_scale) + 1))
+        return cls([pygame.transform.smoothscale(image, (size, size)) for size in sizes], sizes)
+
+    @classmethod
+    def from_sheet(cls, sheet, frame_width, frame_height=None, count=None):
+        # Frames are read left to right, then top to bottom
+        frame_height = frame_height or sheet.get_height()
+        frames = []
+        for y in range(0, sheet.get_height() - frame_height + 1, frame_height):
+            for x in range(0, sheet.get_width() - frame_width + 1, frame_width):
+                frames.append(sheet.subsurface((x, y, frame_width, frame_height)))
+        return cls(frames[:count])
+
+    def nearest(self, size):
+        # Frame of a scaled() animation closest to the requested size
+        index = bisect.bisect_left(self.sizes, size)
+        if index == len(self.sizes) or (index > 0 and size - self.sizes[index - 1] < self.sizes[index] - size):
+            index -= 1
+        return self.frames[index]
+
+    def frame(self, position):
+        return self.frames[int(position) % len(self.frames)]
+
+class DirtyRegions:
+    """Screen regions that changed since the last display update.
+
+    Widgets add the rects they change; the main loop redraws the scene once
+    per region, clipped to it, and pushes only the changed rects with
+    pygame.display.update. Overlapping rects are merged into one region, but
+    distant ones stay separate so a blink in one corner and a pulse in
+    another do not repaint everything between them. When
+    nothing is dirty the frame is skipped entirely. With DIRTY_RECTS off every
+    frame is a full redraw and flip.
+    """
+
+    def __init__(self):
+        self.rects = []
+        self.full = True
+
+    def add(self, rect):
+        self.rects.append(pygame.Rect(rect))
+
+    def invalidate(self):
+        # Redraw the whole screen, e.g. after switching scenes
+        self.full = True
+
+    def pending(self):
+        return self.full or bool(self.rects) or not DIRTY_RECTS
+
+    def regions(self):
+        """Clip rects to redraw the scene through: the whole screen, or the dirty rects with overlaps merged."""
+        if self.full or not DIRTY_RECTS:
+            return [screen.get_rect()]
+        merged = []
+        for rect in self.rects:
+            rect = rect.copy()
+            # Swallow every region this one overlaps; once grown it may reach others
+            index = rect.collidelist(merged)
+            while index >= 0:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def flush(self):
+        if self.full or not DIRTY_RECTS:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self.rects)
+        self.rects = []
+        self.full = False
+
+dirty = DirtyRegions()
+
+class FramePacer:
+    """Decides how long each loop iteration sleeps before handling events.
+
+    While something animates, and for INPUT_ACTIVE_MS after any event so
+    typing and hovering stay responsive, frames run at ACTIVE_FPS. Otherwise
+    the loop sleeps until the next scheduled change, at most IDLE_FRAME_MS.
+    With FRAME_PACING off every frame runs at ACTIVE_FPS. Wall and CPU time
+    are tallied per state so report() can show what each state costs.
+
+    Idle frames sleep in Clock.tick rather than pygame.event.wait: pygame's
+    wait with a timeout polls the event queue every millisecond, which costs
+    more CPU than drawing at 60 fps.
+    """
+
+    def __init__(self):
+        self.clock = pygame.time.Clock()
+        self.stats = {}  # state: [frames, seconds, CPU seconds]
+        self.state = None
+        self.started = None
+        self.cpu_started = None
+        self.last_event = 0
+
+    def events(self, state, animating=False, timeout=None):
+        """Wait for the next frame and return the pending events.
+
+        state names what the loop is doing, for the report; timeout is the
+        milliseconds until the caller next needs to redraw without an event.
+        """
+        now = pygame.time.get_ticks()
+        if animating or not FRAME_PACING:
+            frame_ms = 1000 / ACTIVE_FPS
+        elif now - self.last_event < INPUT_ACTIVE_MS:
+            frame_ms = 1000 / ACTIVE_FPS
+            state = "input"
+        else:
+            frame_ms = IDLE_FRAME_MS if timeout is None else min(timeout, IDLE_FRAME_MS)
+            frame_ms = max(frame_ms, 1000 / ACTIVE_FPS)
+
+        self.account(state)
+        self.clock.tick(1000 / frame_ms)
+        events = pygame.event.get()
+        if events:
+            self.last_event = pygame.time.get_ticks()
+        return events
+
+    def account(self, state):
+        # Charge the frame that just ended to the state it was in
+        now = time.perf_counter()
+        cpu = time.process_time()
+        if self.state is not None:
+            stats = self.stats.setdefault(self.state, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += now - self.started
+            stats[2] += cpu - self.cpu_started
+        self.state = state
+        self.started = now
+        self.cpu_started = cpu
+
+    def report(self):
+        for state, (frames, seconds, cpu) in self.stats.items():
+            if seconds > 0:
+                print(f"Frames ({state}): {frames / seconds:.1f} fps, {cpu / seconds * 100:.1f}% CPU "
+                      f"over {seconds:.1f}s")
+
+pacer = FramePacer()
+
+def new_layer(size):
+    # Colorkeyed rather than per-pixel alpha: shapes are not antialiased and RLE blits are cheap
+    layer = pygame.Surface(size).convert()
+    layer.fill(LAYER_COLORKEY)
+    layer.set_colorkey(LAYER_COLORKEY, pygame.RLEACCEL)
+    return layer
+
+def build_background(size):
+    # Background with subtle pattern
+    layer = pygame.Surface(size).convert()
+    layer.fill(BACKGROUND_COLOR)
+    for i in range(0, size[0], 20):
+        for j in range(0, size[1], 20):
+            pygame.draw.circle(layer, (240, 242, 245), (i, j), 1)
+    return layer
+
+def build_overlay(size):
+    # Semi-transparent game over overlay
+    layer = pygame.Surface(size).convert()
+    layer.fill(BACKGROUND_COLOR)
+    layer.set_alpha(200)
+    return layer
+
+def build_text_area_frame(size, scrollbar_width):
+    layer = new_layer(size)
+    rect = layer.get_rect()
+    pygame.draw.rect(layer, WHITE, rect, border_radius=BORDER_RADIUS)
+    pygame.draw.rect(layer, TEXT_COLOR, rect, 2, border_radius=BORDER_RADIUS)
+    scrollbar_rect = pygame.Rect(size[0] - scrollbar_width, 0, scrollbar_width, size[1])
+    pygame.draw.rect(layer, LIGHT_GRAY, scrollbar_rect, border_radius=BORDER_RADIUS)
+    return layer
+
+def build_input_frame(size, active):
+    # Two pixels of margin on each side for the glow
+    layer = new_layer((size[0] + 4, size[1] + 4))
+    rect = pygame.Rect(2, 2, size[0], size[1])
+    pygame.draw.rect(layer, WHITE if active else LIGHT_GRAY, rect, border_radius=BORDER_RADIUS)
+    if active:
+        pygame.draw.rect(layer, PRIMARY_COLOR, layer.get_rect(), 4, border_radius=BORDER_RADIUS)
+    border_color = PRIMARY_COLOR if active else TEXT_COLOR
+    pygame.draw.rect(layer, border_color, rect, 2, border_radius=BORDER_RADIUS)
+    return layer
+
+def build_badge(size, color):
+    radius = size[0] // 2
+    layer = new_layer(size)
+    center = (radius, radius)
+
+    # Outer circle with gradient
+    for i in range(5):
+        ring_color = tuple(min(c + i*10, 255) for c in color)
+        pygame.draw.circle(layer, ring_color, center, radius - i)
+
+    # Inner circle
+    pygame.draw.circle(layer, WHITE, center, radius - 5)
+    return layer
+
+# Per-font memo of word widths used by wrap_text
+word_widths = {}
+MAX_MEMO_WORDS = 20000
+
+# Summed word widths drift from a measured line by kerning and rounding; allow
+# this many pixels per unmeasured join before trusting the estimate
+WRAP_ERROR_PER_JOIN = 2
+
+def measure_word(font, word):
+    widths = word_widths.get(font)
+    if widths is None or len(widths) > MAX_MEMO_WORDS:
+        widths = word_widths[font] = {}
+    width = widths.get(word)
+    if width is None:
+        width = widths[word] = font.size(word)[0]
+    return width
+
+def break_word(word, font, max_width):
+    # Split a word wider than the line into the longest pieces that fit
+    pieces = []
+    start = 0
+    while start < len(word):
+        low, high = start + 1, len(word)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if font.size(word[start:mid])[0] <= max_width:
+                low = mid
+            else:
+                high = mid - 1
+        pieces.append(word[start:low])
+        start = low
+    return pieces
 
 def wrap_text(text, font, max_width):
-    words = text.split(' ')
+    """Greedily wrap text into lines no wider than max_width.
+
+    Word widths are memoized per font and summed as words are added, so a line
+    is only measured as a whole when the running estimate is too close to
+    max_width to decide. Words wider than a line are broken across lines.
+    """
+    space_width = measure_word(font, ' ')
     lines = []
     current_line = []
+    line_width = 0
+    unmeasured = 0  # Joins added to line_width since it was last measured exactly
 
-    for word in words:
-        current_line.append(word)
-        test_line = ' '.join(current_line)
-        width = font.size(test_line)[0]
+    for word in text.split(' '):
+        word_width = measure_word(font, word)
 
-        if width > max_width:
-            if len(current_line) > 1:
-                current_line.pop()
+        if word_width > max_width:
+            if current_line:
                 lines.append(' '.join(current_line))
-                current_line = [word]
-            else:
-                lines.append(word)
-                current_line = []
+            pieces = break_word(word, font, max_width)
+            lines.extend(pieces[:-1])
+            current_line = [pieces[-1]]
+            line_width = font.size(pieces[-1])[0]
+            unmeasured = 0
+            continue
+
+        if not current_line:
+            current_line = [word]
+            line_width = word_width
+            unmeasured = 0
+            continue
+
+        estimate = line_width + space_width + word_width
+        error = WRAP_ERROR_PER_JOIN * (unmeasured + 1)
+        if estimate + error <= max_width:
+            fits = True
+            unmeasured += 1
+        elif estimate - error > max_width:
+            fits = False
+        else:
+            estimate = font.size(' '.join(current_line) + ' ' + word)[0]
+            fits = estimate <= max_width
+            unmeasured = 0
+
+        if fits:
+            current_line.append(word)
+            line_width = estimate
+        else:
+            lines.append(' '.join(current_line))
+            current_line = [word]
+            line_width = word_width
+            unmeasured = 0
 
     if current_line:
         lines.append(' '.join(current_line))
 
     return lines
 
+# Wrapped lines pre-rendered together into one strip surface
+STRIP_LINES = 8
+MAX_STRIPS = 8
+
 class ScrollableTextArea:
-    def __init__(self, x, y, width, height, max_lines=10):
+    """Scrollable list of wrapped text lines.
+
+    Lines are rendered once into strips of STRIP_LINES lines, kept in a small
+    LRU, and each frame only the whole lines visible at scroll_position are
+    blitted from them. With max_scrollback set, the oldest lines are dropped
+    a strip at a time once that many are held. Line indices passed to mark()
+    and truncate() are absolute, so they stay valid when lines are dropped.
+    """
+
+    def __init__(self, x, y, width, height, max_lines=10, max_scrollback=None):
         self.x = x
         self.y = y
         self.width = width
         self.height = height
         self.max_lines = max_lines
+        self.max_scrollback = max_scrollback
         self.lines = []
+        self.first_line = 0  # Absolute index of self.lines[0]
+        self.strips = OrderedDict()
         self.scroll_position = 0
         self.rect = pygame.Rect(x, y, width, height)
         self.scrollbar_width = 20
         self.text_width = width - self.scrollbar_width - (2 * PADDING)
+        self.strip_size = (width - self.scrollbar_width - PADDING, STRIP_LINES * LINE_HEIGHT)
         self.scrollbar_rect = pygame.Rect(x + width - self.scrollbar_width, y, self.scrollbar_width, height)
         self.scrollbar_handle_height = max(20, height * (height / (max_lines * LINE_HEIGHT)))
         self.scrollbar_handle_rect = pygame.Rect(x + width - self.scrollbar_width, y, self.scrollbar_width, self.scrollbar_handle_height)
@@ -201,20 +732,83 @@ class ScrollableTextArea:
     def add_line(self, text):
         # Wrap the text before adding
         wrapped_lines = wrap_text(text, font, self.text_width)
+        start = len(self.lines)
         self.lines.extend(wrapped_lines)
+        self.lines_changed(start)
+
+    def append_to_last_line(self, text):
+        # Only the last wrapped line can change when text is appended, so rewrap just that
+        last_line = self.lines.pop() if self.lines else ""
+        start = len(self.lines)
+        self.lines.extend(wrap_text(last_line + text, font, self.text_width))
+        self.lines_changed(start)
+
+    def mark(self):
+        # Absolute index of the next line to be added
+        return self.first_line + len(self.lines)
+
+    def truncate(self, mark):
+        # Remove every line from a mark() onward
+        start = max(0, mark - self.first_line)
+        del self.lines[start:]
+        self.lines_changed(start)
+
+    def lines_changed(self, start):
+        # Strips from the first changed line onward are stale
+        first_stale = (self.first_line + start) // STRIP_LINES
+        for index in [i for i in self.strips if i >= first_stale]:
+            del self.strips[index]
+
+        if self.max_scrollback is not None and len(self.lines) > self.max_scrollback:
+            self.page_out()
+
+        dirty.add(self.rect)
         self.total_height = len(self.lines) * LINE_HEIGHT
         self.update_scrollbar()
         # Auto-scroll to bottom when new content is added
         if self.total_height > self.height:
             self.scroll_position = self.total_height - self.height
 
+    def page_out(self):
+        # Drop the oldest lines in whole strips so strip boundaries stay aligned
+        excess = len(self.lines) - self.max_scrollback
+        dropped = -(-excess // STRIP_LINES) * STRIP_LINES
+        del self.lines[:dropped]
+        self.first_line += dropped
+        first_kept = self.first_line // STRIP_LINES
+        for index in [i for i in self.strips if i < first_kept]:
+            del self.strips[index]
+        self.scroll_position = max(0, self.scroll_position - dropped * LINE_HEIGHT)
+
+    def strip(self, index):
+        surface = self.strips.get(index)
+        if surface is not None:
+            self.strips.move_to_end(index)
+            return surface
+
+        # Text on the panel's white, keyed out so the frame border shows through
+        surface = pygame.Surface(self.strip_size).convert()
+        surface.fill(WHITE)
+        start = index * STRIP_LINES - self.first_line
+        for row, line in enumerate(self.lines[start:start + STRIP_LINES]):
+            surface.blit(render_text(font, line, TEXT_COLOR), (0, row * LINE_HEIGHT))
+        surface.set_colorkey(WHITE, pygame.RLEACCEL)
+
+        self.strips[index] = surface
+        if len(self.strips) > MAX_STRIPS:
+            self.strips.popitem(last=False)
+        return surface
+
     def clear(self):
         self.lines = []
+        self.first_line = 0
+        self.strips.clear()
         self.scroll_position = 0
         self.total_height = 0
         self.update_scrollbar()
 
     def update_scrollbar(self):
+        dirty.add(self.rect)
         if self.total_height > self.height:
             visible_ratio = self.height / self.total_height
             self.scrollbar_handle_height = max(20, self.height * visible_ratio)
@@ -249,34 +843,45 @@ class ScrollableTextArea:
                 self.update_scrollbar()
 
     def draw(self, surface):
-        # Draw background with rounded corners
-        pygame.draw.rect(surface, WHITE, self.rect, border_radius=BORDER_RADIUS)
-        pygame.draw.rect(surface, TEXT_COLOR, self.rect, 2, border_radius=BORDER_RADIUS)
+        # Draw background with rounded corners and the scrollbar track
+        frame = layers.get("text_area_frame", (self.width, self.height), build_text_area_frame, self.scrollbar_width)
+        surface.blit(frame, self.rect)
 
-        # Create a clipping area for the text
+        # Create a clipping area for the text, within any clip already set for dirty regions
         clip_rect = pygame.Rect(self.x, self.y, self.width - self.scrollbar_width, self.height)
         old_clip = surface.get_clip()
-        surface.set_clip(clip_rect)
+        surface.set_clip(clip_rect.clip(old_clip))
 
-        # Draw text
+        # Find the whole lines that fit in the area at the current scroll position
         visible_height = self.height - (2 * PADDING)
         visible_lines = min(visible_height // LINE_HEIGHT + 1, len(self.lines))
         start_index = int(self.scroll_position // LINE_HEIGHT)
+        first_y = self.y - (self.scroll_position % LINE_HEIGHT) + PADDING
 
+        shown = []
         for i in range(visible_lines):
             line_index = start_index + i
             if 0 <= line_index < len(self.lines):
-                text = font.render(self.lines[line_index], True, TEXT_COLOR)
-                y_pos = self.y + i * LINE_HEIGHT - (self.scroll_position % LINE_HEIGHT) + PADDING
+                y_pos = first_y + i * LINE_HEIGHT
                 if self.y <= y_pos <= self.y + self.height - LINE_HEIGHT:
-                    surface.blit(text, (self.x + PADDING, y_pos))
+                    shown.append(line_index)
+
+        # Blit those lines from their strips, one blit per strip
+        if shown:
+            first_shown = shown[0] + self.first_line
+            last_shown = shown[-1] + self.first_line
+            for strip_index in range(first_shown // STRIP_LINES, last_shown // STRIP_LINES + 1):
+                strip_start = strip_index * STRIP_LINES
+                top = max(first_shown, strip_start)
+                bottom = min(last_shown, strip_start + STRIP_LINES - 1)
+                area = pygame.Rect(0, (top - strip_start) * LINE_HEIGHT,
+                                   self.strip_size[0], (bottom - top + 1) * LINE_HEIGHT)
+                y_pos = first_y + (top - self.first_line - start_index) * LINE_HEIGHT
+                surface.blit(self.strip(strip_index), (self.x + PADDING, y_pos), area)
 
         # Reset clipping
         surface.set_clip(old_clip)
 
-        # Draw scrollbar background
-        pygame.draw.rect(surface, LIGHT_GRAY, self.scrollbar_rect, border_radius=BORDER_RADIUS)
-
         # Draw scrollbar if needed
         if self.total_height > self.height:
             pygame.draw.rect(surface, PRIMARY_COLOR, self.scrollbar_handle_rect, border_radius=BORDER_RADIUS)
@@ -315,7 +920,7 @@ class Button:
 
         # Draw text
         text_color = WHITE if self.is_restart else TEXT_COLOR
-        text_surface = font.render(self.text, True, text_color)
+        text_surface = render_text(font, self.text, text_color)
         text_rect = text_surface.get_rect(center=button_rect.center)
 
         # Apply scale animation
@@ -325,15 +930,27 @@ class Button:
         surface.blit(text_surface, text_rect)
 
     def handle_event(self, event):
+        state = (self.hover, self.pressed)
+        clicked = False
         if event.type == pygame.MOUSEMOTION:
             self.hover = self.rect.collidepoint(event.pos)
         elif event.type == pygame.MOUSEBUTTONDOWN:
             if self.hover:
                 self.pressed = True
-                return True
+                clicked = True
         elif event.type == pygame.MOUSEBUTTONUP:
             self.pressed = False
-        return False
+        if (self.hover, self.pressed) != state:
+            # Pressed buttons are drawn 2px down and right
+            dirty.add(self.rect.inflate(4, 4))
+        return clicked
+
+def warm_up():
+    """Check and load the model on a worker, then start prefetching scenarios. Returns the seconds taken."""
+    try:
+        return ollama.warm_up()
+    finally:
+        scenario_queue.fill()
 
 class StartMenu:
     def __init__(self):
@@ -344,206 +961,233 @@ class StartMenu:
                                 "Convince AI it's TRUE", SECONDARY_COLOR)
         self.false_button = Button(center_x, 370, button_width, button_height,
                                  "Convince AI it's FALSE", PRIMARY_COLOR)
+        self.model_status = f"Loading {ollama.model}..."
+        self.model_status_color = TEXT_COLOR
+
+    def set_model_status(self, event):
+        # Result of the warm-up started in main()
+        if event.error is not None:
+            self.model_status = str(event.error)
+            self.model_status_color = ACCENT_COLOR
+            print(f"Model check failed: {event.error}")  # Debug logging
+        else:
+            self.model_status = f"{ollama.model} ready"
+            print(f"Model loaded in {event.result:.1f}s")  # Debug logging
+        dirty.invalidate()
 
     def run(self):
         running = True
+        dirty.invalidate()
         while running:
-            for event in pygame.event.get():
+            # Nothing on the menu animates; buttons only change on mouse events
+            for event in pacer.events("menu"):
                 if event.type == pygame.QUIT:
                     return None
+                if event.type == LLM_RESULT_EVENT and event.purpose == "warmup":
+                    self.set_model_status(event)
+                    continue
 
                 if self.true_button.handle_event(event):
                     return True
                 if self.false_button.handle_event(event):
                     return False
 
-            screen.fill(WHITE)
-
-            # Draw title with large font
-            title = large_font.render("Choose Your Role", True, BLACK)
-            title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 200))
-            screen.blit(title, title_rect)
+            if not dirty.pending():
+                continue
 
-            # Draw buttons
-            self.true_button.draw(screen)
-            self.false_button.draw(screen)
+            for region in dirty.regions():
+                screen.set_clip(region)
+                self.draw()
+            screen.set_clip(None)
+            dirty.flush()
+            first_frame_drawn()
 
-            pygame.display.flip()
+    def draw(self):
+        screen.fill(WHITE)
+
+        # Draw title with large font
+        title = render_text(large_font, "Choose Your Role", BLACK)
+        title_rect = title.get_rect(center=(WINDOW_WIDTH // 2, 200))
+        screen.blit(title, title_rect)
+
+        # Draw buttons
+        self.true_button.draw(screen)
+        self.false_button.draw(screen)
+
+        status = render_text(small_font, self.model_status, self.model_status_color)
+        screen.blit(status, status.get_rect(center=(WINDOW_WIDTH // 2, 460)))
+
+class ScenarioQueue:
+    """Bounded queue of ready-made scenarios that refills itself in the background.
+
+    generate(count) returns a list of scenarios, so one call can top up
+    several slots at once. Refills run on a dedicated thread so prefetching
+    never takes a worker slot away from a turn in progress, and start once the
+    queue is down to half full. Each finished refill posts a "prefetch"
+    LLM_RESULT_EVENT so a game that found the queue empty can pick one up,
+    and a refill that raises falls back to one scenario from fallback().
+    """
+
+    def __init__(self, generate, fallback, size=5):
+        self.generate = generate
+        self.fallback = fallback
+        self.size = size
+        self.ready = deque()
+        self.filling = False
+        self.stopped = False
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scenario-prefetch")
+
+    def fill(self):
+        with self.lock:
+            if self.stopped or self.filling or len(self.ready) > self.size // 2:
+                return
+            self.filling = True
+            # Under the lock, so shutdown() cannot close the executor in between
+            self.executor.submit(self._produce, self.size - len(self.ready))
 
-class AISprite:
-    def generate_scenario(self):
+    def _produce(self, count):
+        scenarios = []
         try:
-            # First attempt with entertaining but thought-provoking prompt
-            response = requests.post(
-                'http://localhost:11434/api/generate',
-                json={
-                    "model": "gemma3:4b",
-                    "prompt": """Generate ONE entertaining but thought-provoking statement for debate. The statement should be:
-1. A clear declarative statement (not a question)
-2. Something that could be argued as true or false
-3. Combines everyday things with bigger concepts
-4. Has a touch of humor while being debatable
-5. Could have interesting evidence on both sides
-
-Examples of good statements:
-- "Cats possess an innate understanding of quantum physics"
-- "Procrastination is actually a form of time travel"
-- "Pizza tastes better because it believes in you"
-- "Houseplants secretly judge our life choices"
-- "Parallel universes are created by lost socks in the dryer"
-- "The internet experiences emotions just like humans do"
-- "Smartphones intentionally die at dramatic moments"
-- "Dreams are bug reports from the simulation we live in"
-
-Rules:
-- Must be a STATEMENT, not a question
-- Should be debatable but not absurd
-- Mix mundane objects with profound concepts
-- Keep it relatable but intriguing
-- Make it fun but arguable
-
-Generate ONE entertaining statement. Return ONLY the statement, nothing else.""",
-                    "stream": False
-                }
-            )
-
-            scenario = response.json()['response'].strip().strip('"')
-
-            # If the response is empty or too short, try a second prompt
-            if len(scenario) < 10:
-                response = requests.post(
-                    'http://localhost:11434/api/generate',
-                    json={
-                        "model": "gemma3:4b",
-                        "prompt": """Create ONE amusing debate statement about:
-- Everyday objects having secret lives
-- Technology having hidden wisdom
-- Food having metaphysical properties
-- Pets having cosmic knowledge
-- Time having personal preferences
-- Common annoyances having deeper meaning
-
-Make it a clear declarative statement (not a question).
-Return ONLY the statement.""",
-                        "stream": False
-                    }
-                )
-                scenario = response.json()['response'].strip().strip('"')
-
-            # Clean up any common formatting issues
-            scenario = scenario.replace("The statement: ", "").replace("Scenario: ", "").strip()
-
-            # Convert questions to statements if needed
-            if scenario.endswith("?"):
-                scenario = scenario[:-1] + "."
-            if scenario.lower().startswith("what if "):
-                scenario = scenario[8:].capitalize()
-            if scenario.lower().startswith("why do "):
-                scenario = scenario[7:].capitalize() + " because of cosmic laws."
-
-            # If still empty or too short, generate a procedural scenario
-            if len(scenario) < 10:
-                # Generate a procedural scenario using entertaining templates
-                subjects = [
-                    "Your coffee maker",
-                    "The internet",
-                    "Traffic lights",
-                    "Your bed",
-                    "Social media",
-                    "The refrigerator",
-                    "Your favorite song",
-                    "The weekend",
-                    "Your computer",
-                    "The weather"
-                ]
-                verbs = [
-                    "possesses the wisdom of",
-                    "secretly controls",
-                    "understands",
-                    "manipulates",
-                    "communicates with",
-                    "influences",
-                    "philosophically aligns with",
-                    "channels the energy of",
-                    "transcends",
-                    "bends"
-                ]
-                effects = [
-                    "ancient cosmic knowledge",
-                    "the space-time continuum",
-                    "quantum mathematics",
-                    "parallel dimensions",
-                    "universal consciousness",
-                    "metaphysical reality",
-                    "the laws of physics",
-                    "human motivation",
-                    "cosmic harmony",
-                    "the collective unconscious"
-                ]
-
-                scenario = f"{random.choice(subjects)} {random.choice(verbs)} {random.choice(effects)}"
-
-            print(f"Generated scenario: {scenario}")  # Debug logging
-            return scenario
-
+            if not self.stopped:
+                scenarios = self.generate(count)
         except Exception as e:
-            print(f"Error generating scenario: {str(e)}")  # Debug logging
-            # Generate a procedural scenario as fallback
-            topics = [
-                "Smartphones possess emotional intelligence",
-                "Vegetables experience philosophical enlightenment",
-                "The internet has achieved consciousness",
-                "Cars develop personalities based on their owners",
-                "Mirrors reflect alternate realities",
-                "Gym equipment conspires for human health",
-                "Calendars manipulate the flow of time",
-                "Autocorrect has literary aspirations",
-                "Keys teleport to test human patience",
-                "Clouds are shepherds of cosmic energy"
-            ]
-
-            return random.choice(topics)
-
+            print(f"Error prefetching scenarios: {str(e)}")  # Debug logging
+            scenarios = [self.fallback()]
+        finally:
+            with self.lock:
+                self.filling = False
+                for scenario in scenarios:
+                    if len(self.ready) < self.size and scenario not in self.ready:
+                        self.ready.append(scenario)
+            # Always answer, or a game showing "Generating..." would wait forever
+            llm_worker.post(LLM_RESULT_EVENT, purpose="prefetch", game_id=None, result=None, error=None)
+            # A short batch can leave the queue below the refill mark
+            self.fill()
+
+    def pop(self):
+        """Take a scenario without blocking; returns None if none is ready yet."""
+        with self.lock:
+            scenario = self.ready.popleft() if self.ready else None
+        self.fill()
+        return scenario
+
+    def shutdown(self):
+        with self.lock:
+            self.stopped = True
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+scenario_queue = ScenarioQueue(lambda count: generate_scenarios(ollama, count), fallback_scenario)
+
+class AISprite(Debate):
     def __init__(self, convince_true):
+        super().__init__(convince_true)
         self.x = WINDOW_WIDTH - 250  # Adjusted position
         self.y = WINDOW_HEIGHT // 2
-        self.conviction = 0 if convince_true else 100
-        self.current_scenario = self.generate_scenario()
-        self.convince_true = convince_true
-        self.response = "Convince me!" if convince_true else "I believe this is true. Prove me wrong!"
         self.thinking = False
         self.animation_frame = 0
-        self.animation_speed = 0.1
+        self.animation_speed = 6  # Radians per second, so the pulse keeps its pace at any frame rate
         self.scale = 1.0
-        self.conversation_history = []
-        self.complete_history = []
-        self.response_count = 0
-        self.MAX_RESPONSES = 10
         self.autoplay = False
         self.last_autoplay_time = 0
         self.autoplay_delay = 2000
         self.autosave_timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         self.waiting_for_auto_response = False  # New flag for single auto response
+        self.auto_pending = False  # Auto-player request is on the worker
+        self.game_id = 0  # Bumped on reset so stale worker results are dropped
+        self.reply_line_start = 0  # First conversation line of the reply in progress
+        self.reply_streaming = False
         self.thinking_dots = 0
         self.last_dot_update = 0
         self.dot_update_delay = 500  # Update dots every 500ms
+        self.drawn_state = None  # (sprite size, thinking, dots, conviction) as last drawn
 
         # Create text areas with adjusted spacing for new font sizes
         self.scenario_area = ScrollableTextArea(50, 30, WINDOW_WIDTH - 400, 100, 5)
-        self.conversation_area = ScrollableTextArea(50, 150, WINDOW_WIDTH - 400, WINDOW_HEIGHT - 300, 20)
+        self.conversation_area = ScrollableTextArea(50, 150, WINDOW_WIDTH - 400, WINDOW_HEIGHT - 300, 20,
+                                                    max_scrollback=1000)
+
+        self.request_scenario()
+
+    @property
+    def busy(self):
+        # True while the game is waiting on the worker and should not accept a new turn
+        return self.thinking or self.current_scenario is None or self.waiting_for_auto_response
+
+    def start_thinking(self):
+        self.thinking = True
+        self.thinking_dots = 0
+        self.last_dot_update = pygame.time.get_ticks()
+
+    def request_scenario(self):
+        scenario = scenario_queue.pop()
+        if scenario is not None:
+            self.set_scenario(scenario)
+            return
+
+        # Queue ran dry; the next "prefetch" result fills in the scenario
+        self.start_thinking()
+        self.scenario_area.add_line(f"{EMOJI_SCENARIO} Scenario: Generating...")
+
+    def set_scenario(self, scenario):
+        self.current_scenario = scenario
+        self.thinking = False
 
         # Add content with better formatting and simpler Unicode
+        self.scenario_area.clear()
         self.scenario_area.add_line(f"{EMOJI_SCENARIO} Scenario: {self.current_scenario}")
-        self.scenario_area.add_line(f"{EMOJI_GOAL} Your goal: Convince the AI that this is {'TRUE' if convince_true else 'FALSE'}")
+        self.scenario_area.add_line(f"{EMOJI_GOAL} Your goal: Convince the AI that this is {'TRUE' if self.convince_true else 'FALSE'}")
         self.scenario_area.add_line(f"{EMOJI_RESPONSES} Responses remaining: {self.MAX_RESPONSES - self.response_count}")
         self.conversation_area.add_line(f"{EMOJI_AI} AI: {self.response}")
         self.complete_history.append(f"AI: {self.response}")
 
-        self.autosave_conversation()
+        # Autosave initial state
+        self.log_event("scenario", scenario=self.current_scenario,
+                       goal='TRUE' if self.convince_true else 'FALSE', max_responses=self.MAX_RESPONSES)
+        self.log_message("ai", "AI", self.response)
+
+    def handle_llm_result(self, event):
+        """Apply a finished worker call on the main thread. Returns True when the game is over."""
+        if event.purpose == "warmup":
+            if event.error is not None:
+                # The player started before the model check came back
+                self.conversation_area.add_line(f"AI: {event.error}")
+            return False
+
+        if event.purpose == "prefetch":
+            if self.current_scenario is None:
+                scenario = scenario_queue.pop()
+                if scenario is not None:
+                    self.set_scenario(scenario)
+            return False
+
+        if event.game_id != self.game_id:
+            return False  # Result belongs to a game that has since been reset
+
+        if event.purpose == "auto":
+            automated_response = self.finish_automated_response(event.result, event.error)
+            self.auto_pending = False
+            self.waiting_for_auto_response = False  # Reset after generating one response
+            return self.get_ai_response(automated_response)
+        elif event.purpose == "reply":
+            return self.finish_ai_response(event.result, event.error)
+        return False
 
-    def draw(self):
+    def handle_llm_token(self, event):
+        if event.game_id != self.game_id or not self.thinking:
+            return
+
+        if not self.reply_streaming:
+            # First token replaces the "Thinking..." placeholder
+            self.conversation_area.truncate(self.reply_line_start)
+            self.conversation_area.add_line(f"AI: {event.token}")
+            self.reply_streaming = True
+        else:
+            self.conversation_area.append_to_last_line(event.token)
+
+    def update(self):
         # Animate the AI sprite
-        self.animation_frame += self.animation_speed
+        self.animation_frame = pygame.time.get_ticks() / 1000 * self.animation_speed
         if self.thinking:
             self.scale = 1.0 + 0.05 * abs(math.sin(self.animation_frame))
 
@@ -552,21 +1196,55 @@ Return ONLY the statement.""",
             if current_time - self.last_dot_update > self.dot_update_delay:
                 self.thinking_dots = (self.thinking_dots + 1) % 4
                 self.last_dot_update = current_time
+        else:
+            self.scale = 1.0
+
+        # Report the regions whose drawn state changed
+        size = int(150 * self.scale)
+        state = (size, self.thinking, self.thinking_dots, self.conviction)
+        if self.drawn_state is None or state[0] != self.drawn_state[0]:
+            dirty.add(self.sprite_rect())
+        if self.drawn_state is None or state[1:3] != self.drawn_state[1:3]:
+            dirty.add(self.thinking_rect())
+        if self.drawn_state is None or state[3] != self.drawn_state[3]:
+            dirty.add(self.meter_rect())
+            dirty.add(self.badge_rect())
+        self.drawn_state = state
+
+    def sprite_rect(self):
+        # Covers the sprite at its largest pulse
+        return pygame.Rect(0, 0, 160, 160).move(self.x - 80, self.y - 80)
+
+    def thinking_rect(self):
+        return render_text(font, "Thinking...", PRIMARY_COLOR).get_rect(center=(self.x, self.y + 150))
+
+    def meter_rect(self):
+        return pygame.Rect(self.x - 100, self.y + 100, 200, 15)
+
+    def badge_rect(self):
+        # Badge circle plus the CONVICTION label below it
+        circle_radius = 35
+        circle_pos = (WINDOW_WIDTH - circle_radius - 20, circle_radius + 20)
+        badge = pygame.Rect(0, 0, circle_radius * 2 + 1, circle_radius * 2 + 1)
+        badge.center = circle_pos
+        label = render_text(small_font, "CONVICTION", TEXT_COLOR).get_rect(
+            center=(circle_pos[0], circle_pos[1] + circle_radius + 10))
+        return badge.union(label)
 
+    def draw(self):
+        if self.thinking:
             # Draw thinking indicator
             dots = "." * self.thinking_dots
             thinking_text = f"Thinking{dots}"
-            thinking_surface = font.render(thinking_text, True, PRIMARY_COLOR)
+            thinking_surface = render_text(font, thinking_text, PRIMARY_COLOR)
             thinking_rect = thinking_surface.get_rect(center=(self.x, self.y + 150))
             screen.blit(thinking_surface, thinking_rect)
-        else:
-            self.scale = 1.0
 
         # Draw AI sprite
-        scaled_sprite = pygame.transform.scale(ai_sprite,
-            (int(150 * self.scale), int(150 * self.scale)))  # Larger sprite
+        scaled_sprite = ai_animation.nearest(int(150 * self.scale))  # Larger sprite
         sprite_rect = scaled_sprite.get_rect(center=(self.x, self.y))
         screen.blit(scaled_sprite, sprite_rect)
+        profiler.mark("ai_sprite")
 
         # Draw conviction meter with modern style
         meter_width = 200  # Wider meter
@@ -592,393 +1270,156 @@ Return ONLY the statement.""",
         circle_radius = 35  # Slightly smaller
         circle_pos = (WINDOW_WIDTH - circle_radius - 20, circle_radius + 20)
 
-        # Draw outer circle with gradient
-        for i in range(5):
-            radius = circle_radius - i
-            color = PRIMARY_COLOR if self.convince_true else ACCENT_COLOR
-            color = tuple(min(c + i*10, 255) for c in color)
-            pygame.draw.circle(screen, color, circle_pos, radius)
-
-        # Draw inner circle
-        inner_radius = circle_radius - 5
-        pygame.draw.circle(screen, WHITE, circle_pos, inner_radius)
+        # Gradient rings and inner circle come from a cached layer
+        badge_color = PRIMARY_COLOR if self.convince_true else ACCENT_COLOR
+        badge = layers.get("badge", (circle_radius * 2 + 1, circle_radius * 2 + 1), build_badge, badge_color)
+        screen.blit(badge, badge.get_rect(center=circle_pos))
 
         # Draw score text with large font
-        score_surface = large_font.render(score_text, True, TEXT_COLOR)
+        score_surface = render_text(large_font, score_text, TEXT_COLOR)
         score_rect = score_surface.get_rect(center=circle_pos)
         screen.blit(score_surface, score_rect)
 
         # Draw "CONVICTION" text below with small font
-        label_surface = small_font.render("CONVICTION", True, TEXT_COLOR)
+        label_surface = render_text(small_font, "CONVICTION", TEXT_COLOR)
         label_rect = label_surface.get_rect(center=(circle_pos[0], circle_pos[1] + circle_radius + 10))
         screen.blit(label_surface, label_rect)
+        profiler.mark("ai_meter_badge")
 
         # Draw text areas
         self.scenario_area.draw(screen)
+        profiler.mark("scenario_area")
         self.conversation_area.draw(screen)
+        profiler.mark("conversation_area")
 
     def get_automated_response(self):
-        try:
-            # Format conversation history
-            history_text = "\n".join(self.conversation_history[-6:] if self.conversation_history else [])
-
-            # Create a prompt for the player AI
-            response = requests.post(
-                'http://localhost:11434/api/generate',
-                json={
-                    "model": "gemma3:4b",
-                    "prompt": f"""You are an AI debater trying to convince another AI about a scenario. Be persuasive and use logical arguments.
-
-🎯 Current scenario: "{self.current_scenario}"
-💬 Your goal: Convince the AI that this is {'TRUE' if self.convince_true else 'FALSE'}
-⚡ Responses left: {self.MAX_RESPONSES - self.response_count}
-
-Previous conversation:
-{history_text}
-
-🔥 Response Guidelines:
-- Use compelling evidence and logical arguments
-- Be concise but persuasive
-- {'Present evidence and logical proofs to support the truth' if self.convince_true else 'Present evidence and logical arguments to disprove this'}
-- Adapt your strategy based on the AI\'s previous responses
-- For false claims, focus on debunking with facts
-- For true claims, focus on providing supporting evidence
-
-{f'🚨 Getting urgent now - only {self.MAX_RESPONSES - self.response_count} chances left to make your point!' if self.MAX_RESPONSES - self.response_count <= 3 else ''}
-
-Your response (write a natural, human-like message):""",
-                    "stream": False
-                }
-            )
-            response_text = response.json()['response']
+        prompt = self.automated_prompt()
+        self.auto_pending = True
+        llm_worker.submit("auto", self.game_id, self.fetch_automated_response, prompt)
+
+    def fetch_automated_response(self, prompt):
+        # Runs on the LLM worker
+        return ollama.generate(prompt, purpose="auto-player")['response']
 
+    def finish_automated_response(self, response_text, error):
+        if error is None:
             # Add automated response to conversation area
             self.conversation_area.add_line(f"Player (Auto): {response_text}")
+            self.log_message("auto", "Player (Auto)", response_text)
             return response_text
 
-        except Exception as e:
-            # Fallback to predefined responses
-            if self.convince_true:
-                responses = [
-                    "Look, I've seen this with my own eyes!",
-                    "Let me tell you about my personal experience with this.",
-                    "I know this sounds crazy, but hear me out...",
-                    "Trust me, I've done a lot of research on this.",
-                    "I can show you proof right now.",
-                    "This happened to me personally.",
-                    "I was skeptical too until I learned about this.",
-                    "Think about it logically for a second.",
-                    "Let me explain why this makes sense.",
-                    "I totally understand your doubt, but..."
-                ]
-                self.conviction = min(100, self.conviction + 15)
-            else:
-                responses = [
-                    "Wait, that's not right at all!",
-                    "I used to believe that too, but then I learned...",
-                    "That's a common mistake, let me explain why.",
-                    "I know for a fact this isn't true because...",
-                    "Trust me, I've looked into this extensively.",
-                    "That's just an old myth people keep spreading.",
-                    "I thought the same thing until I found out...",
-                    "Let me show you why this doesn't make sense.",
-                    "I understand why you'd think that, but...",
-                    "That's actually been proven wrong many times."
-                ]
-                self.conviction = max(0, self.conviction - 15)
-            fallback_response = random.choice(responses)
-            self.conversation_area.add_line(f"Player (Auto-Fallback): {fallback_response}")
-            return fallback_response
+        # Fallback to predefined responses
+        fallback_response = self.fallback_automated_response()
+        self.conversation_area.add_line(f"Player (Auto-Fallback): {fallback_response}")
+        self.log_message("auto", "Player (Auto-Fallback)", fallback_response)
+        return fallback_response
 
     def get_ai_response(self, player_input):
+        """Start an AI turn. The reply is fetched on the worker and applied by finish_ai_response."""
         if self.response_count >= self.MAX_RESPONSES:
-            # More varied end-game responses
-            if self.convince_true:
-                if self.conviction >= 70:
-                    endings = [
-                        "You've done it! Your compelling evidence and logical reasoning have won me over. I now see the truth in this.",
-                        "I can't deny it anymore - you've presented such strong arguments that I'm fully convinced now.",
-                        "What a revelation! Your evidence has completely changed my perspective. I believe you're right.",
-                        "Remarkable! You've successfully shown me the truth. Your arguments were absolutely convincing."
-                    ]
-                else:
-                    endings = [
-                        "Time's up! While you raised some interesting points, I'm still not convinced by the evidence.",
-                        "Nice try, but your arguments weren't quite strong enough to change my mind on this.",
-                        "I appreciate the effort, but I remain skeptical. The evidence just wasn't compelling enough.",
-                        "We're done here, and I'm still not seeing enough proof to believe this claim."
-                    ]
-            else:
-                if self.conviction <= 30:
-                    endings = [
-                        "You've successfully debunked this! Your evidence has thoroughly disproven my initial belief.",
-                        "I stand corrected! Your arguments have completely dismantled my previous position.",
-                        "I was wrong - you've shown me clear evidence that this isn't true at all.",
-                        "You've convinced me completely. The evidence against this is overwhelming."
-                    ]
-                else:
-                    endings = [
-                        "Time's up! Your arguments weren't enough to shake my conviction in this.",
-                        "I've heard your points, but I still believe this is true. You haven't provided enough evidence.",
-                        "Sorry, but I remain convinced. Your arguments didn't effectively counter the evidence.",
-                        "We're done, and I still stand by my initial position. The counter-arguments weren't strong enough."
-                    ]
-            self.response = random.choice(endings)
+            self.ending()
             self.conversation_area.add_line(f"AI: {self.response}")
-            self.complete_history.append(f"AI: {self.response}")
-            self.autosave_conversation()
+            self.log_message("ai", "AI", self.response)
             return True
 
-        self.response_count += 1
-        self.thinking = True
-        self.thinking_dots = 0
-        self.last_dot_update = pygame.time.get_ticks()
-
-        # Add "Thinking..." to conversation area immediately
-        self.conversation_area.add_line(f"AI: Thinking...")
+        turn = self.begin_turn(player_input)
+        self.start_thinking()
 
-        try:
-            # Add current input to conversation area and history
-            self.conversation_area.add_line(f"Player: {player_input}")
-            self.conversation_history.append(f"Player: {player_input}")
-            self.complete_history.append(f"Player: {player_input}")
-
-            # Keep only last 6 exchanges for context
-            history_pairs = []
-            for i in range(0, len(self.conversation_history)-1, 2):
-                if i+1 < len(self.conversation_history):
-                    history_pairs.append((self.conversation_history[i], self.conversation_history[i+1]))
-            history_pairs = history_pairs[-3:]  # Keep last 3 exchanges
-
-            # Format conversation history for AI context
-            history_text = ""
-            for player_msg, ai_msg in history_pairs:
-                history_text += f"{player_msg}\n{ai_msg}\n\n"
-            history_text += f"Player: {player_input}\n"  # Add current input
-
-            # Calculate response style based on conviction and responses left
-            responses_left = self.MAX_RESPONSES - self.response_count
-            conviction_level = "high" if self.conviction > 70 else "low" if self.conviction < 30 else "medium"
-
-            # Generate dynamic personality traits based on game state
-            personality_traits = []
-            if self.convince_true:
-                if conviction_level == "low":
-                    personality_traits = ["deeply skeptical", "requires solid evidence", "analytically minded"]
-                elif conviction_level == "medium":
-                    personality_traits = ["cautiously interested", "open to new ideas", "thoughtfully considering"]
-                else:
-                    personality_traits = ["nearly convinced", "excited by the evidence", "eager to understand more"]
-            else:
-                if conviction_level == "high":
-                    personality_traits = ["strongly convinced", "confident in their belief", "seeking to understand opposing views"]
-                elif conviction_level == "medium":
-                    personality_traits = ["starting to question", "weighing both sides", "carefully analyzing"]
-                else:
-                    personality_traits = ["doubting their position", "reconsidering the evidence", "open to being wrong"]
-
-            # Extract key points from player's argument
-            key_points_prompt = f"""Extract 2-3 key points from this argument: "{player_input}"
-            Format: Just the points, one per line, no numbers or bullets."""
-
-            key_points_response = requests.post(
-                'http://localhost:11434/api/generate',
-                json={
-                    "model": "gemma3:4b",
-                    "prompt": key_points_prompt,
-                    "stream": False
-                }
-            )
-            key_points = key_points_response.json()['response'].strip()
-
-            response = requests.post(
-                'http://localhost:11434/api/generate',
-                json={
-                    "model": "gemma3:4b",
-                    "prompt": f"""You are an AI with a distinct personality in a debate about: "{self.current_scenario}"
-
-Your Current State:
-- Personality: {random.choice(personality_traits)}
-- Conviction Level: {conviction_level}
-- Responses Left: {responses_left}
-- Goal: You are {'being convinced this is true' if self.convince_true else 'being convinced this is false'}
-
-Key Points from Player's Latest Argument:
-{key_points}
-
-Recent Conversation History:
-{history_text}
-
-Response Guidelines:
-1. NEVER use generic phrases like "Hmm" or "Interesting"
-2. ALWAYS address at least one specific point from the player's argument
-3. Base your response on your conviction level:
-   - High conviction: Challenge their evidence firmly but fairly
-   - Medium conviction: Show openness while raising specific concerns
-   - Low conviction: Acknowledge good points while seeking final clarification
-4. Show clear reasoning for why you agree or disagree with their points
-5. If nearing the end ({responses_left} responses left), be more decisive
-6. Keep responses concise but meaningful
-
-Write a natural response that directly addresses their argument:""",
-                    "stream": False
-                }
-            )
-            response_text = response.json()['response']
-            self.response = response_text
-
-            # Remove the "Thinking..." line before adding the actual response
-            self.conversation_area.lines.pop()
-            self.conversation_area.add_line(f"AI: {response_text}")
-            self.conversation_history.append(f"AI: {response_text}")
-            self.complete_history.append(f"AI: {response_text}")
-            self.autosave_conversation()
-
-            # Update conviction based on response content and current state
-            conviction_change = 0
-            positive_indicators = ["compelling", "convincing", "good point", "makes sense", "i see", "you're right", "valid", "agree"]
-            negative_indicators = ["doubt", "skeptical", "not sure", "unconvinced", "disagree", "but still", "however", "yet"]
-            strong_indicators = ["absolutely", "completely", "definitely", "totally", "fully", "strongly"]
-
-            # Calculate base conviction change
-            response_lower = response_text.lower()
-            if self.convince_true:
-                for indicator in positive_indicators:
-                    if indicator in response_lower:
-                        base_change = 10
-                        # Check if indicator is preceded by a strong indicator
-                        for strong in strong_indicators:
-                            if f"{strong} {indicator}" in response_lower:
-                                base_change *= 1.5
-                        conviction_change += base_change
-                for indicator in negative_indicators:
-                    if indicator in response_lower:
-                        conviction_change -= 5
-            else:
-                for indicator in positive_indicators:
-                    if indicator in response_lower:
-                        base_change = 10
-                        for strong in strong_indicators:
-                            if f"{strong} {indicator}" in response_lower:
-                                base_change *= 1.5
-                        conviction_change -= base_change
-                for indicator in negative_indicators:
-                    if indicator in response_lower:
-                        conviction_change += 5
-
-            # Apply conviction change with momentum and context
-            if self.convince_true:
-                if self.conviction > 50:  # Already leaning towards convinced
-                    conviction_change *= 1.5
-                elif responses_left <= 3:  # Near the end
-                    conviction_change *= 1.2
-                self.conviction = min(100, max(0, self.conviction + conviction_change))
-            else:
-                if self.conviction < 50:  # Already leaning towards doubt
-                    conviction_change *= 1.5
-                elif responses_left <= 3:  # Near the end
-                    conviction_change *= 1.2
-                self.conviction = min(100, max(0, self.conviction + conviction_change))
-
-            # Force a decision on the last response if appropriate
-            if responses_left <= 1:
-                if self.convince_true and self.conviction >= 70:
-                    self.conviction = 100
-                    return True
-                elif not self.convince_true and self.conviction <= 30:
-                    self.conviction = 0
-                    return True
+        # Add current input to conversation area
+        self.conversation_area.add_line(f"Player: {player_input}")
+        self.log_message("player", "Player", player_input)
 
-        except Exception as e:
-            # Remove the "Thinking..." line before adding the error response
-            self.conversation_area.lines.pop()
-            error_response = "Error connecting to AI model"
-            self.conversation_area.add_line(f"AI: {error_response}")
-            self.complete_history.append(f"AI: {error_response}")
-            self.autosave_conversation()
+        # Add "Thinking..." to conversation area immediately; it is replaced by the reply
+        self.reply_line_start = self.conversation_area.mark()
+        self.reply_streaming = False
+        self.conversation_area.add_line(f"AI: Thinking...")
 
-        self.thinking = False
+        llm_worker.submit("reply", self.game_id, self.fetch_ai_response, self.game_id, self.session, *turn)
         return False
 
-    def autosave_conversation(self):
-        # Create an autosave file with timestamp of game start
-        if not hasattr(self, 'autosave_timestamp'):
-            self.autosave_timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    def fetch_ai_response(self, game_id, session, *turn):
+        # Runs on the LLM worker, so it only uses the snapshot passed in; the
+        # session belongs to this game and is not touched again until the turn ends
+        if not STREAM_RESPONSES:
+            return generate_reply(ollama, *turn, session=session)
 
-        # Ensure conversations directory exists
-        if not os.path.exists("conversations"):
-            os.makedirs("conversations")
+        # Forward each token to the main loop as it arrives
+        on_token = lambda token: llm_worker.post(LLM_TOKEN_EVENT, game_id=game_id, token=token)
+        return generate_reply(ollama, *turn, on_token=on_token, session=session)
 
-        filename = f"conversations/autosave_{self.autosave_timestamp}.txt"
+    def finish_ai_response(self, response_text, error):
+        self.thinking = False
 
-        try:
-            with open(filename, "w") as f:
-                f.write(f"Scenario: {self.current_scenario}\n")
-                f.write(f"Goal: Convince AI that this is {'TRUE' if self.convince_true else 'FALSE'}\n")
-                f.write(f"Current Conviction: {self.conviction}%\n")
-                f.write(f"Responses remaining: {self.MAX_RESPONSES - self.response_count}\n")
-                f.write("\nConversation:\n")
-                f.write("-" * 50 + "\n")
-
-                # Group lines into exchanges (player + AI)
-                exchanges = []
-                current_exchange = []
-                for line in self.conversation_area.lines:
-                    current_exchange.append(line)
-                    if line.startswith("AI:"):
-                        exchanges.append(current_exchange)
-                        current_exchange = []
-
-                # Write each exchange with a separator
-                for exchange in exchanges:
-                    for line in exchange:
-                        f.write(f"{line}\n")
-                    f.write("-" * 50 + "\n")
-
-                # Write any remaining lines
-                for line in current_exchange:
-                    f.write(f"{line}\n")
+        # Remove the "Thinking..." line (or the streamed partial reply) before adding the actual response
+        self.conversation_area.truncate(self.reply_line_start)
 
-        except Exception as e:
-            print(f"Autosave failed: {str(e)}")
+        if error is not None:
+            print(f"Error getting AI response: {str(error)}")  # Debug logging
+            error_response = "Error connecting to AI model"
+            self.conversation_area.add_line(f"AI: {error_response}")
+            self.complete_history.append(f"AI: {error_response}")
+            self.log_message("ai", "AI", error_response)
+            return False
+
+        self.conversation_area.add_line(f"AI: {response_text}")
+        game_over = self.apply_reply(response_text)
+        self.log_message("ai", "AI", response_text)
+        return game_over
+
+    def log_message(self, role, speaker, text):
+        self.log_event("message", role=role, speaker=speaker, text=text)
+
+    def log_event(self, kind, **fields):
+        # Queued for the background writer; every event carries the current game state
+        conversation_log.log(f"conversations/autosave_{self.autosave_timestamp}.jsonl", {
+            "event": kind,
+            "time": datetime.datetime.now().isoformat(timespec="milliseconds"),
+            **fields,
+            "conviction": self.conviction,
+            "responses_left": self.MAX_RESPONSES - self.response_count,
+        })
 
     def reset(self):
-        # Create new autosave timestamp for new game
-        self.autosave_timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-
-        self.conviction = 0 if self.convince_true else 100
-        self.current_scenario = self.generate_scenario()
-        self.response = "Convince me!" if self.convince_true else "I believe this is true. Prove me wrong!"
-        self.conversation_history = []
-        self.complete_history = []
-        self.response_count = 0
+        if self.current_scenario is not None:
+            self.log_event("end", reason="reset")
+
+        # Create new autosave timestamp for new game; the log is appended to, so never reuse one
+        self.game_id += 1
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        if self.autosave_timestamp.startswith(timestamp):
+            timestamp += f"_{self.game_id}"
+        self.autosave_timestamp = timestamp
+
+        self.new_game()
+        self.waiting_for_auto_response = False
+        self.auto_pending = False
         self.scenario_area.clear()
         self.conversation_area.clear()
-        self.scenario_area.add_line(f"{EMOJI_SCENARIO} Scenario: {self.current_scenario}")
-        self.scenario_area.add_line(f"{EMOJI_GOAL} Your goal: Convince the AI that this is {'TRUE' if self.convince_true else 'FALSE'}")
-        self.scenario_area.add_line(f"{EMOJI_RESPONSES} Responses remaining: {self.MAX_RESPONSES - self.response_count}")
-        self.conversation_area.add_line(f"{EMOJI_AI} AI: {self.response}")
-        self.complete_history.append(f"AI: {self.response}")
-
-        # Autosave initial state
-        self.autosave_conversation()
+        self.request_scenario()
 
 class Player:
     def __init__(self):
         self.x = 100
         self.y = WINDOW_HEIGHT // 2
         self.animation_frame = 0
-        self.animation_speed = 0.1
+        self.animation_speed = 6  # Radians per second, so the pulse keeps its pace at any frame rate
         self.scale = 1.0
+        self.drawn_size = None
 
-    def draw(self):
+    def update(self):
         # Animate the player sprite
-        self.animation_frame += self.animation_speed
+        self.animation_frame = pygame.time.get_ticks() / 1000 * self.animation_speed
         self.scale = 1.0 + 0.02 * abs(math.sin(self.animation_frame))
 
+        # The scaled size only changes every few frames; redraw when it does
+        size = int(100 * self.scale)
+        if size != self.drawn_size:
+            dirty.add(pygame.Rect(self.x - 52, self.y - 52, 104, 104))
+            self.drawn_size = size
+
+    def draw(self):
         # Draw player sprite
-        scaled_sprite = pygame.transform.scale(player_sprite,
-            (int(100 * self.scale), int(100 * self.scale)))
+        scaled_sprite = player_animation.nearest(int(100 * self.scale))
         sprite_rect = scaled_sprite.get_rect(center=(self.x, self.y))
         screen.blit(scaled_sprite, sprite_rect)
 
@@ -988,33 +1429,145 @@ class InputBox:
         self.text = ""
         self.active = False
         self.text_width = width - (2 * PADDING)
+        # Wrapped layout of the text: each line, its offset into self.text and,
+        # once needed, the width of every prefix of the line
         self.lines = []
-        self.cursor_visible = True
-        self.cursor_timer = 0
-        self.cursor_blink_rate = 30
+        self.line_starts = []
+        self.prefix_widths = []
+        self.cursor_visible = False
+        self.cursor_blink_rate = 500  # Milliseconds per blink phase
         self.selection_start = None
         self.selection_end = None
         self.cursor_pos = 0
         self.placeholder_text = "Type your argument here..."
         self.dragging = False
+        self.locked = False  # Enter does not submit while a turn is in flight
 
     def handle_event(self, event):
+        state = (self.text, self.cursor_pos, self.selection_start, self.selection_end, self.active)
+        result = self.process_event(event)
+        if (self.text, self.cursor_pos, self.selection_start, self.selection_end, self.active) != state:
+            # Includes the 2px glow around the active box
+            dirty.add(self.rect.inflate(4, 4))
+        return result
+
+    def clear(self):
+        self.text = ""
+        self.lines = []
+        self.line_starts = []
+        self.prefix_widths = []
+        self.selection_start = None
+        self.selection_end = None
+        self.cursor_pos = 0
+        dirty.add(self.rect.inflate(4, 4))
+
+    def next_blink(self, current_time):
+        # Milliseconds until the cursor next turns on or off, or None when it is not shown
+        if not self.active:
+            return None
+        return self.cursor_blink_rate - current_time % self.cursor_blink_rate
+
+    def update(self, current_time):
+        # Blink the cursor on a fixed period
+        visible = self.active and (current_time // self.cursor_blink_rate) % 2 == 0
+        if visible != self.cursor_visible:
+            self.cursor_visible = visible
+            dirty.add(self.rect)
+
+    def replace_text(self, start, end, new_text):
+        # Replace self.text[start:end] and reflow the lines it touched
+        self.text = self.text[:start] + new_text + self.text[end:]
+        self.reflow(start, end, start + len(new_text))
+
+    def layout(self, text, start, end):
+        # Wrap text[start:end], returning the lines and their offsets into text
+        lines = wrap_text(text[start:end], font, self.text_width)
+        starts = []
+        pos = start
+        for line in lines:
+            starts.append(pos)
+            pos += len(line)
+            if pos < end and text[pos] == ' ':
+                pos += 1  # Space consumed by the line break
+        return lines, starts
+
+    def reflow(self, edit_start, old_end, new_end):
+        """Rewrap after text[edit_start:old_end] was replaced by text[edit_start:new_end].
+
+        Lines ending before the edit keep their breaks, except the one just
+        before it, which may take back words if the edited line got shorter.
+        Lines after the edit are reused once the new breaks line up with the
+        old ones again, so typing in a long paste only rewraps a line or two.
+        """
+        text = self.text.replace('\n', ' ')
+        if not self.lines:
+            self.lines, self.line_starts = self.layout(text, 0, len(text))
+            self.prefix_widths = [None] * len(self.lines)
+            return
+
+        delta = new_end - old_end
+        first = max(0, bisect.bisect_right(self.line_starts, edit_start) - 2)
+        start = self.line_starts[first]
+        edited = bisect.bisect_right(self.line_starts, old_end) - 1
+
+        step = 1
+        resume = edited + step
+        while resume < len(self.lines):
+            # An old line can be reused if the break before it is at a space and its
+            # first word still does not fit on the rewrapped line above
+            resume_at = self.line_starts[resume] + delta
+            if text[resume_at - 1] == ' ':
+                lines, starts = self.layout(text, start, resume_at - 1)
+                next_word = self.lines[resume].split(' ')[0]
+                if font.size(lines[-1] + ' ' + next_word)[0] > self.text_width:
+                    self.lines[first:resume] = lines
+                    self.line_starts[first:] = starts + [s + delta for s in self.line_starts[resume:]]
+                    self.prefix_widths[first:resume] = [None] * len(lines)
+                    return
+            step *= 2
+            resume = edited + step
+
+        lines, starts = self.layout(text, start, len(text))
+        self.lines[first:] = lines
+        self.line_starts[first:] = starts
+        self.prefix_widths[first:] = [None] * len(lines)
+
+    def line_prefix(self, index):
+        # Width of every prefix of a line, measured once per line change
+        widths = self.prefix_widths[index]
+        if widths is None:
+            line = self.lines[index]
+            widths = self.prefix_widths[index] = [font.size(line[:i])[0] for i in range(len(line) + 1)]
+        return widths
+
+    def position_at(self, pos, clamp):
+        # Text offset under a screen position, or None if it is below the last line
+        click_x = pos[0] - (self.rect.x + PADDING)
+        click_y = pos[1] - (self.rect.y + PADDING)
+        line_index = click_y // LINE_HEIGHT
+        if clamp:
+            line_index = max(0, min(len(self.lines) - 1, line_index))
+        else:
+            line_index = max(0, line_index)
+        if line_index >= len(self.lines):
+            return None
+        line = self.lines[line_index]
+        # First character whose left edge is past the click
+        i = bisect.bisect_right(self.line_prefix(line_index), click_x, 0, len(line))
+        return self.line_starts[line_index] + i
+
+    def line_at(self, text_pos):
+        return max(0, bisect.bisect_right(self.line_starts, text_pos) - 1)
+
+    def process_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # Left click only
             # Handle mouse click
             self.active = self.rect.collidepoint(event.pos)
             if self.active:
                 # Calculate cursor position based on click
-                click_x = event.pos[0] - (self.rect.x + PADDING)
-                click_y = event.pos[1] - (self.rect.y + PADDING)
-                line_index = click_y // LINE_HEIGHT
-                if line_index < len(self.lines):
-                    line = self.lines[line_index]
-                    for i, char in enumerate(line):
-                        if font.size(line[:i])[0] > click_x:
-                            self.cursor_pos = sum(len(l) for l in self.lines[:line_index]) + i
-                            break
-                    else:
-                        self.cursor_pos = sum(len(l) for l in self.lines[:line_index]) + len(line)
+                position = self.position_at(event.pos, clamp=False)
+                if position is not None:
+                    self.cursor_pos = position
                 self.selection_start = self.cursor_pos
                 self.selection_end = self.cursor_pos
                 self.dragging = True
@@ -1026,53 +1579,41 @@ class InputBox:
 
         elif event.type == pygame.MOUSEMOTION:
             if self.active and self.dragging:  # Only update selection while dragging
-                click_x = event.pos[0] - (self.rect.x + PADDING)
-                click_y = event.pos[1] - (self.rect.y + PADDING)
-                line_index = max(0, min(len(self.lines) - 1, click_y // LINE_HEIGHT))
-                if line_index < len(self.lines):
-                    line = self.lines[line_index]
-                    for i, char in enumerate(line):
-                        if font.size(line[:i])[0] > click_x:
-                            self.cursor_pos = sum(len(l) for l in self.lines[:line_index]) + i
-                            break
-                    else:
-                        self.cursor_pos = sum(len(l) for l in self.lines[:line_index]) + len(line)
+                position = self.position_at(event.pos, clamp=True)
+                if position is not None:
+                    self.cursor_pos = position
                     self.selection_end = self.cursor_pos
 
         elif event.type == pygame.KEYDOWN and self.active:
             if event.key == pygame.K_RETURN:
                 if event.mod & pygame.KMOD_SHIFT:  # Shift+Enter for new line
-                    self.text += '\n'
+                    self.replace_text(len(self.text), len(self.text), '\n')
                     return None
-                elif self.text.strip():  # Regular Enter to submit
+                elif self.text.strip() and not self.locked:  # Regular Enter to submit
                     text = self.text
-                    self.text = ""
-                    self.lines = []
-                    self.selection_start = None
-                    self.selection_end = None
-                    self.cursor_pos = 0
+                    self.clear()
                     return text
             elif event.key == pygame.K_BACKSPACE:
                 if self.selection_start is not None and self.selection_start != self.selection_end:
                     # Delete selected text
                     start = min(self.selection_start, self.selection_end)
                     end = max(self.selection_start, self.selection_end)
-                    self.text = self.text[:start] + self.text[end:]
+                    self.replace_text(start, end, "")
                     self.cursor_pos = start
                     self.selection_start = self.selection_end = None
                 elif self.cursor_pos > 0:
-                    self.text = self.text[:self.cursor_pos-1] + self.text[self.cursor_pos:]
+                    self.replace_text(self.cursor_pos - 1, self.cursor_pos, "")
                     self.cursor_pos -= 1
             elif event.key == pygame.K_DELETE:
                 if self.selection_start is not None and self.selection_start != self.selection_end:
                     # Delete selected text
                     start = min(self.selection_start, self.selection_end)
                     end = max(self.selection_start, self.selection_end)
-                    self.text = self.text[:start] + self.text[end:]
+                    self.replace_text(start, end, "")
                     self.cursor_pos = start
                     self.selection_start = self.selection_end = None
                 elif self.cursor_pos < len(self.text):
-                    self.text = self.text[:self.cursor_pos] + self.text[self.cursor_pos + 1:]
+                    self.replace_text(self.cursor_pos, self.cursor_pos + 1, "")
             elif event.key == pygame.K_LEFT:
                 if event.mod & pygame.KMOD_SHIFT:
                     if self.selection_start is None:
@@ -1110,11 +1651,11 @@ class InputBox:
                     if self.selection_start is not None and self.selection_start != self.selection_end:
                         start = min(self.selection_start, self.selection_end)
                         end = max(self.selection_start, self.selection_end)
-                        self.text = self.text[:start] + clipboard_text + self.text[end:]
+                        self.replace_text(start, end, clipboard_text)
                         self.cursor_pos = start + len(clipboard_text)
                         self.selection_start = self.selection_end = None
                     else:
-                        self.text = self.text[:self.cursor_pos] + clipboard_text + self.text[self.cursor_pos:]
+                        self.replace_text(self.cursor_pos, self.cursor_pos, clipboard_text)
                         self.cursor_pos += len(clipboard_text)
                 except:
                     pass
@@ -1123,91 +1664,330 @@ class InputBox:
                 self.selection_start = 0
                 self.selection_end = len(self.text)
                 self.cursor_pos = self.selection_end
-            else:
+            elif event.unicode:
                 if self.selection_start is not None and self.selection_start != self.selection_end:
                     start = min(self.selection_start, self.selection_end)
                     end = max(self.selection_start, self.selection_end)
-                    self.text = self.text[:start] + event.unicode + self.text[end:]
-                    self.cursor_pos = start + 1
+                    self.replace_text(start, end, event.unicode)
+                    self.cursor_pos = start + len(event.unicode)
                     self.selection_start = self.selection_end = None
                 else:
-                    self.text = self.text[:self.cursor_pos] + event.unicode + self.text[self.cursor_pos:]
-                    self.cursor_pos += 1
-            # Wrap text
-            self.lines = wrap_text(self.text.replace('\n', ' '), font, self.text_width)
+                    self.replace_text(self.cursor_pos, self.cursor_pos, event.unicode)
+                    self.cursor_pos += len(event.unicode)
         return None
 
     def draw(self, surface):
-        # Draw background with subtle gradient
-        color = WHITE if self.active else LIGHT_GRAY
-        pygame.draw.rect(surface, color, self.rect, border_radius=BORDER_RADIUS)
-
-        # Draw border with glow effect when active
-        if self.active:
-            glow_rect = self.rect.copy()
-            glow_rect.inflate_ip(4, 4)
-            pygame.draw.rect(surface, (*PRIMARY_COLOR, 100), glow_rect, 4, border_radius=BORDER_RADIUS)
-
-        border_color = PRIMARY_COLOR if self.active else TEXT_COLOR
-        pygame.draw.rect(surface, border_color, self.rect, 2, border_radius=BORDER_RADIUS)
+        # Draw background and border, with a glow effect when active
+        frame = layers.get("input_frame", self.rect.size, build_input_frame, self.active)
+        surface.blit(frame, (self.rect.x - 2, self.rect.y - 2))
 
         # Draw placeholder text if empty
         if not self.text and not self.active:
-            placeholder_surface = font.render(self.placeholder_text, True, (150, 150, 150))
+            placeholder_surface = render_text(font, self.placeholder_text, (150, 150, 150))
             surface.blit(placeholder_surface, (self.rect.x + PADDING, self.rect.y + PADDING))
 
-        # Draw text and selection with improved styling
+        # Draw selection with improved styling, visiting only the selected lines
+        if self.selection_start is not None and self.selection_end is not None and self.lines:
+            start = min(self.selection_start, self.selection_end)
+            end = max(self.selection_start, self.selection_end)
+            i = self.line_at(start)
+            while i < len(self.lines) and self.line_starts[i] < end:
+                line_start = self.line_starts[i]
+                sel_start = max(0, start - line_start)
+                sel_end = min(len(self.lines[i]), end - line_start)
+                if sel_start < sel_end:
+                    prefix = self.line_prefix(i)
+                    sel_rect = pygame.Rect(
+                        self.rect.x + PADDING + prefix[sel_start],
+                        self.rect.y + PADDING + i * LINE_HEIGHT,
+                        prefix[sel_end] - prefix[sel_start],
+                        LINE_HEIGHT
+                    )
+                    pygame.draw.rect(surface, (*PRIMARY_COLOR, 50), sel_rect,
+                                   border_radius=4)
+                i += 1
+
+        # Draw text
         y = self.rect.y + PADDING
-        current_pos = 0
-        for i, line in enumerate(self.lines):
-            if self.selection_start is not None and self.selection_end is not None:
-                start = min(self.selection_start, self.selection_end)
-                end = max(self.selection_start, self.selection_end)
-                if start < current_pos + len(line) and end > current_pos:
-                    sel_start = max(0, start - current_pos)
-                    sel_end = min(len(line), end - current_pos)
-                    if sel_start < sel_end:
-                        sel_rect = pygame.Rect(
-                            self.rect.x + PADDING + font.size(line[:sel_start])[0],
-                            y,
-                            font.size(line[sel_start:sel_end])[0],
-                            LINE_HEIGHT
-                        )
-                        pygame.draw.rect(surface, (*PRIMARY_COLOR, 50), sel_rect,
-                                       border_radius=4)
-
-            text_surface = font.render(line, True, TEXT_COLOR)
+        for line in self.lines:
+            text_surface = render_text(font, line, TEXT_COLOR)
             surface.blit(text_surface, (self.rect.x + PADDING, y))
             y += LINE_HEIGHT
-            current_pos += len(line)
 
         # Draw cursor with animation
         if self.active:
-            self.cursor_timer = (self.cursor_timer + 1) % (self.cursor_blink_rate * 2)
-            if self.cursor_timer < self.cursor_blink_rate:
+            if self.cursor_visible:
                 cursor_x = self.rect.x + PADDING
                 cursor_y = self.rect.y + PADDING
-                current_pos = 0
-                for line in self.lines:
-                    if current_pos + len(line) >= self.cursor_pos:
-                        cursor_x += font.size(line[:self.cursor_pos - current_pos])[0]
-                        break
-                    cursor_y += LINE_HEIGHT
-                    current_pos += len(line)
+                if self.lines:
+                    i = self.line_at(self.cursor_pos)
+                    column = min(self.cursor_pos - self.line_starts[i], len(self.lines[i]))
+                    cursor_x += self.line_prefix(i)[column]
+                    cursor_y += i * LINE_HEIGHT
                 pygame.draw.line(surface, PRIMARY_COLOR, (cursor_x, cursor_y),
                                (cursor_x, cursor_y + LINE_HEIGHT), 2)
 
+def build_hud_panel(size):
+    layer = pygame.Surface(size).convert()
+    layer.fill(TEXT_COLOR)
+    layer.set_alpha(240)
+    return layer
+
+def format_ms(value):
+    return "-" if value is None else f"{value:.0f}"
+
+class MetricsHUD:
+    """Overlay of rolling model call statistics per purpose, toggled with F3.
+
+    Shows the calls made, p50/p95 wall-clock latency, median time to first
+    token, generation speed and median client overhead from LLMMetrics.
+    """
+
+    HEADINGS = ("purpose", "calls", "p50 ms", "p95 ms", "ttft", "tok/s", "overhead")
+    COLUMNS = (0, 100, 150, 215, 280, 335, 395)
+    ROWS = 6
+
+    def __init__(self, metrics, x=10, y=10):
+        self.metrics = metrics
+        self.visible = False
+        self.drawn_version = None
+        self.table = None  # Rendered statistics table
+        self.table_version = None  # metrics.version the table was rendered from
+        self.rect = pygame.Rect(x, y, 470, (self.ROWS + 1) * 20 + 2 * PADDING)
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.drawn_version = None
+        dirty.add(self.rect)
+
+    def update(self):
+        # Redraw when a call has been recorded since the last draw
+        if self.visible and self.metrics.version != self.drawn_version:
+            self.drawn_version = self.metrics.version
+            dirty.add(self.rect)
+
+    def draw(self, surface):
+        if not self.visible:
+            return
+        surface.blit(layers.get("hud_panel", self.rect.size, build_hud_panel), self.rect)
+
+        # Rendered once per recorded call; the numbers skip text_cache rather than evict what the game uses
+        version = self.metrics.version
+        if self.table is None or self.table_version != version:
+            rows = [self.HEADINGS]
+            for purpose, stats in sorted(self.metrics.summary().items())[:self.ROWS]:
+                tokens_per_second = stats["tokens_per_second"]
+                rows.append((purpose, str(stats["calls"]), format_ms(stats["wall_p50"]),
+                             format_ms(stats["wall_p95"]), format_ms(stats["ttft_p50"]),
+                             "-" if tokens_per_second is None else f"{tokens_per_second:.1f}",
+                             format_ms(stats["overhead_p50"])))
+            self.table = pygame.Surface((self.rect.width - 2 * PADDING, (self.ROWS + 1) * 20), pygame.SRCALPHA)
+            for row_index, row in enumerate(rows):
+                color = GRAY if row_index == 0 else WHITE
+                for column, text in zip(self.COLUMNS, row):
+                    self.table.blit(small_font.render(text, True, color), (column, row_index * 20))
+            self.table_version = version
+        surface.blit(self.table, (self.rect.x + PADDING, self.rect.y + PADDING))
+
+class FrameProfiler:
+    """Per-stage timings of the main loop, shown as an overlay toggled with F2.
+
+    The loop calls begin() at the top of every frame and mark(stage) after
+    each stage, which charges the time since the previous mark to that stage.
+    Frames that draw nothing only have the wait, events and update stages.
+    While the profiler is off, mark() returns after one attribute check.
+    dump() (F12) writes the recorded frames and per-stage statistics to a
+    JSON file.
+    """
+
+    GRAPH_MS = 33.3  # Height of the frame-time graph
+    STATS_EVERY = 15  # Frames between recomputing the stage table
+
+    def __init__(self, history=240):
+        self.frames = deque(maxlen=history)  # {stage: ms} per frame, stages in the order they ran
+        self.work = deque(maxlen=history)  # Milliseconds per frame outside the wait stage
+        self.intervals = deque(maxlen=history)  # Milliseconds per frame including the wait
+        self.current = None  # Frame being recorded; None while off
+        self.last = 0
+        self.visible = False
+        self.table = None  # Rendered stage table
+        self.drawn = 0
+        self.rect = pygame.Rect(WINDOW_WIDTH - 400, 130, 390, 440)
+
+    def toggle(self):
+        self.visible = not self.visible
+        self.frames.clear()
+        self.work.clear()
+        self.intervals.clear()
+        self.table = None
+        self.current = None
+        dirty.add(self.rect)
+
+    def begin(self):
+        if not self.visible:
+            return
+        now = time.perf_counter()
+        if self.current is not None:
+            self.frames.append(self.current)
+            interval = sum(self.current.values())
+            self.intervals.append(interval)
+            self.work.append(interval - self.current.get("wait", 0))
+        self.current = {}
+        self.last = now
+
+    def mark(self, stage):
+        if self.current is None:
+            return
+        now = time.perf_counter()
+        self.current[stage] = self.current.get(stage, 0) + (now - self.last) * 1000
+        self.last = now
+
+    def update(self):
+        # The graph moves every frame while shown
+        if self.visible:
+            dirty.add(self.rect)
+
+    def stage_stats(self):
+        """{stage: {"mean", "p95", "max"}} in milliseconds over the recorded frames, in stage order."""
+        frames = list(self.frames)
+        stages = {}
+        for frame in frames:
+            for stage in frame:
+                stages.setdefault(stage, None)
+        result = {}
+        for stage in stages:
+            times = sorted(frame.get(stage, 0) for frame in frames)
+            result[stage] = {
+                "mean": round(sum(times) / len(times), 4),
+                "p95": round(times[min(len(times) - 1, int(len(times) * 0.95))], 4),
+                "max": round(times[-1], 4),
+            }
+        return result
+
+    def dump(self, directory="profiles"):
+        """Write the recorded frames and stage statistics to a JSON file and return its path."""
+        if not self.frames:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"frames_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"frames": len(self.frames), "stages": self.stage_stats(),
+                       "history": [{stage: round(ms, 4) for stage, ms in frame.items()} for frame in self.frames]},
+                      f, indent=2)
+        print(f"Frame profile written to {path}")  # Debug logging
+        return path
+
+    def draw(self, surface):
+        if not self.visible:
+            return
+        surface.blit(layers.get("hud_panel", self.rect.size, build_hud_panel), self.rect)
+        x = self.rect.x + PADDING
+        y = self.rect.y + PADDING
+
+        work = self.work
+        if work:
+            header = (f"work {sum(work) / len(work):.2f} ms, max {max(work):.2f} ms, "
+                      f"{1000 * len(self.intervals) / max(sum(self.intervals), 1e-9):.0f} fps")
+        else:
+            header = "recording..."
+        # Numbers change every frame, so they skip text_cache rather than evict what the game uses
+        surface.blit(small_font.render(header, True, WHITE), (x, y))
+
+        graph = pygame.Rect(x, y + 22, self.rect.width - 2 * PADDING, 80)
+        pygame.draw.rect(surface, BLACK, graph)
+        budget_y = graph.bottom - int(graph.height * (1000 / ACTIVE_FPS) / self.GRAPH_MS)
+        pygame.draw.line(surface, ACCENT_COLOR, (graph.x, budget_y), (graph.right - 1, budget_y))
+        bar_width = graph.width / self.frames.maxlen
+        for i, ms in enumerate(work):
+            height = min(graph.height, int(graph.height * ms / self.GRAPH_MS))
+            bar_x = graph.x + int(i * bar_width)
+            pygame.draw.line(surface, SECONDARY_COLOR, (bar_x, graph.bottom - 1), (bar_x, graph.bottom - height))
+
+        # The stage table is recomputed and rendered every few frames
+        self.drawn += 1
+        if self.table is None or self.drawn % self.STATS_EVERY == 0:
+            rows = [("stage", "mean", "p95", "max")]
+            rows += [(stage, f"{stats['mean']:.2f}", f"{stats['p95']:.2f}", f"{stats['max']:.2f}")
+                     for stage, stats in self.stage_stats().items()]
+            self.table = pygame.Surface((graph.width, 15 * 20), pygame.SRCALPHA)
+            for row_index, row in enumerate(rows[:15]):
+                color = GRAY if row_index == 0 else WHITE
+                for column, text in zip((0, 170, 240, 310), row):
+                    self.table.blit(small_font.render(text, True, color), (column, row_index * 20))
+        surface.blit(self.table, (x, graph.bottom + 10))
+
+profiler = FrameProfiler()
+
+def draw_scene(ai, player, input_box, send_button, autoplay_button, game_over):
+    """Draw the whole game screen; main() clips it to the dirty regions."""
+    # Draw background with subtle pattern
+    screen.blit(layers.get("background", screen.get_size(), build_background), (0, 0))
+    profiler.mark("background")
+
+    # Draw UI elements
+    if ai.waiting_for_auto_response:
+        pygame.draw.rect(screen, GRAY, input_box.rect)
+    input_box.draw(screen)
+    profiler.mark("input_box")
+    send_button.draw(screen)
+    autoplay_button.draw(screen)
+    profiler.mark("buttons")
+
+    player.draw()
+    profiler.mark("player")
+    ai.draw()
+
+    # Draw game over state
+    if game_over:
+        # Draw semi-transparent overlay
+        screen.blit(layers.get("overlay", screen.get_size(), build_overlay), (0, 0))
+
+        if ai.won:
+            win_text = render_text(font, "🎉 You convinced the AI! Press R to restart", SECONDARY_COLOR)
+        else:
+            if ai.convince_true:
+                win_text = render_text(font, "❌ Game Over - AI remains unconvinced! Press R to restart", ACCENT_COLOR)
+            else:
+                win_text = render_text(font, "❌ Game Over - AI still believes it's true! Press R to restart", ACCENT_COLOR)
+
+        text_rect = win_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
+        screen.blit(win_text, text_rect)
+        profiler.mark("game_over")
+
+def shutdown():
+    """Stop the background work, close the window and print the session's statistics."""
+    conversation_log.close()
+    llm_worker.shutdown()
+    scenario_queue.shutdown()
+    # Close the window first: cutting off a streaming reply waits for its next chunk
+    pygame.quit()
+    if ollama.cache is not None:
+        stats = ollama.cache.stats()
+        print(f"LLM cache: {stats['hits']} hits, {stats['misses']} misses, "
+              f"{stats['evictions']} evictions, {stats['entries']} entries")
+    for purpose, stats in sorted(ollama.metrics.summary().items()):
+        print(f"LLM {purpose}: {stats['calls']} calls, p50 {format_ms(stats['wall_p50'])} ms, "
+              f"p95 {format_ms(stats['wall_p95'])} ms, {stats['tokens_per_second'] or '-'} tokens/s")
+    ollama.close()
+    pacer.report()
+
 def main():
+    init()
+
+    # Load the model and start generating scenarios while the player is still choosing a side
+    llm_worker.submit("warmup", None, warm_up)
+
     # Start with the menu
     menu = StartMenu()
     convince_true = menu.run()
 
     if convince_true is None:
+        shutdown()
         return
 
-    clock = pygame.time.Clock()
     ai = AISprite(convince_true)
     player = Player()
+    metrics_hud = MetricsHUD(ollama.metrics)
 
     # Create input area with adjusted positioning for new font sizes
     input_box = InputBox(50, WINDOW_HEIGHT - 100, WINDOW_WIDTH - 300, 80)
@@ -1215,76 +1995,77 @@ def main():
     autoplay_button = Button(WINDOW_WIDTH - 230, WINDOW_HEIGHT - 160, 180, 50, f"Auto {EMOJI_AUTO}", PRIMARY_COLOR)
 
     game_over = False
+    last_scene_state = None
+    dirty.invalidate()
 
     while True:
+        profiler.begin()
+
+        # Full frame rate only while the AI thinks (and streams) or a scrollbar is dragged
+        if ai.thinking:
+            state = "thinking"
+        elif ai.conversation_area.dragging or ai.scenario_area.dragging:
+            state = "scrolling"
+        else:
+            state = "idle"
+        now = pygame.time.get_ticks()
+        deadlines = [input_box.next_blink(now)]
+        if ai.waiting_for_auto_response and not ai.auto_pending and not game_over:
+            deadlines.append(ai.last_autoplay_time + ai.autoplay_delay - now)
+        deadlines = [deadline for deadline in deadlines if deadline is not None]
+        events = pacer.events(state, state != "idle", min(deadlines) if deadlines else None)
+        profiler.mark("wait")
+
         current_time = pygame.time.get_ticks()
+        input_box.locked = ai.busy
 
-        for event in pygame.event.get():
+        for event in events:
             if event.type == pygame.QUIT:
-                pygame.quit()
+                if ai.current_scenario is not None:
+                    ai.log_event("end", reason="quit")
+                shutdown()
                 return
 
+            if event.type == LLM_RESULT_EVENT:
+                if ai.handle_llm_result(event):
+                    game_over = True
+                continue
+            if event.type == LLM_TOKEN_EVENT:
+                ai.handle_llm_token(event)
+                continue
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                metrics_hud.toggle()
+                continue
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F2:
+                profiler.toggle()
+                continue
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F12:
+                profiler.dump()
+                continue
+
             ai.scenario_area.handle_event(event)
             ai.conversation_area.handle_event(event)
 
-            if autoplay_button.handle_event(event) and not game_over:
+            if autoplay_button.handle_event(event) and not game_over and not ai.busy:
                 ai.waiting_for_auto_response = True
                 ai.last_autoplay_time = current_time
 
-            if send_button.handle_event(event) and not game_over:
+            if send_button.handle_event(event) and not game_over and not ai.busy:
                 if input_box.text.strip():
                     game_over = ai.get_ai_response(input_box.text)
-                    input_box.text = ""
-                    input_box.lines = []
-                    input_box.selection_start = None
-                    input_box.selection_end = None
-                    input_box.cursor_pos = 0
+                    input_box.clear()
 
             if not ai.waiting_for_auto_response:
                 result = input_box.handle_event(event)
                 if result is not None and not game_over:
                     game_over = ai.get_ai_response(result)
+        profiler.mark("events")
 
-        if ai.waiting_for_auto_response and not game_over and current_time - ai.last_autoplay_time >= ai.autoplay_delay:
-            automated_response = ai.get_automated_response()
-            game_over = ai.get_ai_response(automated_response)
-            ai.waiting_for_auto_response = False  # Reset after generating one response
-
-        # Draw background with subtle pattern
-        screen.fill(BACKGROUND_COLOR)
-        for i in range(0, WINDOW_WIDTH, 20):
-            for j in range(0, WINDOW_HEIGHT, 20):
-                pygame.draw.circle(screen, (240, 242, 245), (i, j), 1)
+        if (ai.waiting_for_auto_response and not ai.auto_pending and not game_over
+                and current_time - ai.last_autoplay_time >= ai.autoplay_delay):
+            ai.get_automated_response()
 
-        # Draw UI elements
-        if ai.waiting_for_auto_response:
-            pygame.draw.rect(screen, GRAY, input_box.rect)
-        input_box.draw(screen)
-        send_button.draw(screen)
-        autoplay_button.draw(screen)
-
-        player.draw()
-        ai.draw()
-
-        # Draw game over state
         if game_over:
-            # Create semi-transparent overlay
-            overlay = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
-            overlay.fill(BACKGROUND_COLOR)
-            overlay.set_alpha(200)
-            screen.blit(overlay, (0, 0))
-
-            if (ai.convince_true and ai.conviction >= 100) or (not ai.convince_true and ai.conviction <= 0):
-                win_text = font.render("🎉 You convinced the AI! Press R to restart", True, SECONDARY_COLOR)
-            else:
-                if ai.convince_true:
-                    win_text = font.render("❌ Game Over - AI remains unconvinced! Press R to restart", True, ACCENT_COLOR)
-                else:
-                    win_text = font.render("❌ Game Over - AI still believes it's true! Press R to restart", True, ACCENT_COLOR)
-
-            text_rect = win_text.get_rect(center=(WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2))
-            screen.blit(win_text, text_rect)
-
             ai.waiting_for_auto_response = False
 
             keys = pygame.key.get_pressed()
@@ -1292,8 +2073,30 @@ def main():
                 ai.reset()
                 game_over = False
 
-        pygame.display.flip()
-        clock.tick(60)
+        # Advance animations; widgets report the regions they change
+        player.update()
+        ai.update()
+        input_box.update(current_time)
+        metrics_hud.update()
+        profiler.update()
+        scene_state = (game_over, ai.waiting_for_auto_response)
+        if scene_state != last_scene_state:
+            dirty.invalidate()
+            last_scene_state = scene_state
+        profiler.mark("update")
+
+        if dirty.pending():
+            for region in dirty.regions():
+                screen.set_clip(region)
+                draw_scene(ai, player, input_box, send_button, autoplay_button, game_over)
+                metrics_hud.draw(screen)
+                profiler.mark("hud")
+                profiler.draw(screen)
+                profiler.mark("profiler")
+
+            screen.set_clip(None)
+            dirty.flush()
+            profiler.mark("flip")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+
+class ResponseCache:
+    """On-disk cache of Ollama completions with a size cap and LRU eviction.
+
+    Entries live in a single SQLite table keyed by a SHA-256 of the request
+    (model, prompt, options and any other request fields except streaming and
+    keep-alive). Responses are stored as zlib-compressed JSON, and an index on
+    the last-used time makes evicting the least recently used entries cheap.
+    Safe to share between the game's worker threads, and between processes
+    such as simulate.py's workers: the size is recounted from the table
+    before evicting, so entries added by others count toward the cap.
+    """
+
+    # Request fields that do not change what the model generates
+    IGNORED_FIELDS = ("stream", "keep_alive")
+
+    def __init__(self, path, max_bytes=64 * 1024 * 1024):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS responses ("
+                        "key BLOB PRIMARY KEY, data BLOB NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL"
+                        ") WITHOUT ROWID")
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self.total_bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @classmethod
+    def make_key(cls, payload):
+        keyed = {k: v for k, v in payload.items() if k not in cls.IGNORED_FIELDS}
+        return hashlib.sha256(json.dumps(keyed, sort_keys=True, ensure_ascii=False).encode()).digest()
+
+    def get(self, payload):
+        key = self.make_key(payload)
+        with self.lock:
+            row = self.db.execute("SELECT data FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(self, payload, response):
+        key = self.make_key(payload)
+        data = zlib.compress(json.dumps(response, ensure_ascii=False).encode())
+        if len(data) > self.max_bytes:
+            return
+
+        with self.lock:
+            self.db.execute("INSERT OR REPLACE INTO responses (key, data, size, last_used) VALUES (?, ?, ?, ?)",
+                            (key, data, len(data), time.time()))
+            self.evict()
+
+    def evict(self):
+        # Caller holds the lock. Another process may have added or evicted entries since our last count
+        self.total_bytes = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        while self.total_bytes > self.max_bytes:
+            rows = self.db.execute("SELECT key, size FROM responses ORDER BY last_used LIMIT 16").fetchall()
+            if not rows:
+                self.total_bytes = 0
+                return
+            for key, size in rows:
+                # Zero rows when another process evicted it first
+                if self.db.execute("DELETE FROM responses WHERE key = ?", (key,)).rowcount:
+                    self.total_bytes -= size
+                    self.evictions += 1
+                if self.total_bytes <= self.max_bytes:
+                    return
+
+    def stats(self):
+        with self.lock:
+            entries = self.db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": self.total_bytes,
+        }
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,102 @@
+import datetime
+import json
+import os
+import threading
+from collections import deque
+
+
+def percentile(values, fraction):
+    # Nearest-rank percentile of an already sorted list
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else None
+
+
+class LLMMetrics:
+    """Timings of every model call, tagged by what the call was for.
+
+    Each record holds Ollama's own timing fields converted to milliseconds
+    (total, load, prompt evaluation and generation), the token counts, the
+    wall-clock time measured by the client, the time to the first streamed
+    token, and the overhead outside Ollama's total (HTTP, JSON and queueing).
+    The last `window` calls per purpose are kept for rolling percentiles, and
+    with a path every record is also appended to that JSONL file. Safe to
+    share between the game's worker threads.
+    """
+
+    def __init__(self, path=None, window=100):
+        self.path = path
+        self.window = window
+        self.calls = {}  # purpose: deque of recent records
+        self.version = 0  # Bumped on every record, so a display can tell when to redraw
+        self.lock = threading.Lock()
+        self.file = None
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.file = open(path, "a", encoding="utf-8")
+
+    def record(self, purpose, model, wall, response=None, first_token=None, cached=False, error=None):
+        """Add one call. wall and first_token are seconds; response is Ollama's final response object."""
+        entry = {
+            "time": datetime.datetime.now().isoformat(timespec="milliseconds"),
+            "purpose": purpose or "other",
+            "model": model,
+            "wall_ms": round(wall * 1000, 2),
+            "ttft_ms": round(first_token * 1000, 2) if first_token is not None else None,
+            "cached": cached,
+        }
+        if error is not None:
+            entry["error"] = str(error)
+        if response is not None and not cached and "total_duration" in response:
+            # Ollama reports durations in nanoseconds
+            for field in ("total", "load", "prompt_eval", "eval"):
+                entry[f"{field}_ms"] = round(response.get(f"{field}_duration", 0) / 1e6, 2)
+            entry["prompt_tokens"] = response.get("prompt_eval_count", 0)
+            entry["eval_tokens"] = response.get("eval_count", 0)
+            entry["tokens_per_second"] = (round(entry["eval_tokens"] / entry["eval_ms"] * 1000, 1)
+                                          if entry["eval_ms"] else None)
+            entry["overhead_ms"] = round(entry["wall_ms"] - entry["total_ms"], 2)
+
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self.lock:
+            self.calls.setdefault(entry["purpose"], deque(maxlen=self.window)).append(entry)
+            self.version += 1
+            if self.file is not None:
+                try:
+                    self.file.write(line)
+                    self.file.flush()
+                except OSError as e:
+                    print(f"Could not write LLM metrics: {str(e)}")  # Debug logging
+                    self.file = None
+        return entry
+
+    def summary(self):
+        """Rolling statistics per purpose over the recent calls that reached the model."""
+        with self.lock:
+            calls = {purpose: list(entries) for purpose, entries in self.calls.items()}
+
+        result = {}
+        for purpose, entries in calls.items():
+            timed = [entry for entry in entries if not entry["cached"] and "error" not in entry]
+            walls = sorted(entry["wall_ms"] for entry in timed)
+            first_tokens = sorted(entry["ttft_ms"] for entry in timed if entry["ttft_ms"] is not None)
+            overheads = sorted(entry["overhead_ms"] for entry in timed if "overhead_ms" in entry)
+            eval_tokens = sum(entry.get("eval_tokens", 0) for entry in timed)
+            eval_ms = sum(entry.get("eval_ms", 0) for entry in timed)
+            result[purpose] = {
+                "calls": len(entries),
+                "cached": sum(entry["cached"] for entry in entries),
+                "errors": sum("error" in entry for entry in entries),
+                "wall_p50": percentile(walls, 0.5),
+                "wall_p95": percentile(walls, 0.95),
+                "ttft_p50": percentile(first_tokens, 0.5),
+                "overhead_p50": percentile(overheads, 0.5),
+                "tokens_per_second": round(eval_tokens / eval_ms * 1000, 1) if eval_ms else None,
+            }
+        return result
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
@@ -0,0 +1,240 @@
+"""Stand-in for the Ollama server, for testing and latency experiments.
+
+Implements /api/generate (streamed and not, including format="json") and
+/api/tags with canned answers, so the game, simulate.py and benchmarks run
+without a model. Answers come from a script file or from a seeded generator,
+and the server can be told how long to wait before the first token, how fast
+to produce the rest and how often to fail.
+
+    python3 mock_ollama.py --port 11435 --ttft 0.3 --tokens-per-second 40
+    OLLAMA_HOST=http://127.0.0.1:11435 python3 game.py
+
+A script is a JSON file holding either a list of replies, used in turn, or
+an object mapping a prompt substring to a reply (or a list of them); the
+first key found in the prompt picks the reply.
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+OPENERS = [
+    "That is a compelling point about",
+    "I see what you mean regarding",
+    "I'm not sure I follow the argument on",
+    "You make a valid case for",
+    "I still doubt the claim about",
+    "However, consider",
+    "That makes sense when it comes to",
+    "I disagree with your take on",
+]
+TOPICS = ["toasters", "quantum cats", "lost socks", "the weekend", "houseplants", "the internet", "coffee"]
+CLOSERS = [
+    "but I need more evidence.",
+    "and I am starting to agree.",
+    "yet the logic has gaps.",
+    "which is absolutely convincing.",
+    "though I remain skeptical.",
+    "so tell me more.",
+]
+
+
+class MockOllama:
+    """Canned-answer Ollama server; start() runs it on a background thread."""
+
+    def __init__(self, host="127.0.0.1", port=11435, model="gemma3:4b", script=None, seed=0, ttft=0.0,
+                 tokens_per_second=0.0, error_rate=0.0, error_status=500):
+        self.model = model
+        self.script = script
+        self.seed = seed
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.lock = threading.Lock()
+        self.seen = {}  # Times each prompt was asked, so repeats get fresh answers
+        self.requests = 0
+        self.scripted = 0
+        self.errors = random.Random(f"{seed}:errors")
+        self.server = ThreadingHTTPServer((host, port), self.handler())
+        self.server.daemon_threads = True
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self.server.serve_forever, name="mock-ollama", daemon=True).start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path == "/api/tags":
+                    self.send_json(200, mock.tags())
+                else:
+                    self.send_json(404, {"error": "not found"})
+
+            def do_POST(self):
+                if self.path != "/api/generate":
+                    self.send_json(404, {"error": "not found"})
+                    return
+                try:
+                    payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                except ValueError:
+                    self.send_json(400, {"error": "invalid JSON"})
+                    return
+                if mock.should_fail():
+                    self.send_json(mock.error_status, {"error": "injected failure"})
+                    return
+                mock.generate(self, payload)
+
+            def send_json(self, status, data):
+                body = json.dumps(data).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def send_chunk(self, data):
+                line = json.dumps(data).encode() + b"\n"
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+                self.wfile.flush()
+
+        return Handler
+
+    def tags(self):
+        return {"models": [{"name": self.model, "model": self.model, "size": 0,
+                            "details": {"family": "mock", "parameter_size": "0B"}}]}
+
+    def should_fail(self):
+        with self.lock:
+            self.requests += 1
+            return self.error_rate > 0 and self.errors.random() < self.error_rate
+
+    def reply(self, payload):
+        prompt = payload.get("prompt", "")
+        with self.lock:
+            count = self.seen[prompt] = self.seen.get(prompt, 0) + 1
+        rng = random.Random(f"{self.seed}:{prompt}:{count}")
+
+        if payload.get("format") == "json":
+            match = re.search(r"Generate (\d+)", prompt)
+            statements = [self.statement(rng) for _ in range(int(match.group(1)) if match else 1)]
+            return json.dumps({"statements": statements})
+
+        if isinstance(self.script, list) and self.script:
+            with self.lock:
+                index = self.scripted
+                self.scripted += 1
+            return self.script[index % len(self.script)]
+        if isinstance(self.script, dict):
+            for key, value in self.script.items():
+                if key in prompt:
+                    return rng.choice(value) if isinstance(value, list) else value
+
+        if "Return ONLY the statement" in prompt:
+            return self.statement(rng)
+        return f"{rng.choice(OPENERS)} {rng.choice(TOPICS)}, {rng.choice(CLOSERS)}"
+
+    def statement(self, rng):
+        # A debate scenario, for the game's scenario prompts
+        return f"{rng.choice(TOPICS).capitalize()} secretly run {rng.choice(TOPICS)}"
+
+    def generate(self, handler, payload):
+        if "prompt" not in payload:
+            # Ollama only loads the model for a request without a prompt
+            handler.send_json(200, {"model": payload.get("model", self.model), "response": "", "done": True,
+                                    "done_reason": "load"})
+            return
+        started = time.perf_counter_ns()
+        text = self.reply(payload)
+        tokens = re.findall(r"\S+\s*", text) or [text]
+        if self.ttft:
+            time.sleep(self.ttft)
+        first_token = time.perf_counter_ns()
+
+        # The context grows by the new prompt and reply, one "token" per word, like a session would
+        prompt_tokens = len(payload.get("prompt", "").split())
+        context = list(payload.get("context") or []) + list(range(prompt_tokens + len(tokens)))
+        final = {"model": payload.get("model", self.model),
+                 "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                 "response": "", "done": True, "done_reason": "stop", "context": context}
+        delay = 1 / self.tokens_per_second if self.tokens_per_second else 0
+
+        if not payload.get("stream", True):
+            time.sleep(delay * len(tokens))
+            final["response"] = text
+        else:
+            handler.send_response(200)
+            handler.send_header("Content-Type", "application/x-ndjson")
+            handler.send_header("Transfer-Encoding", "chunked")
+            handler.end_headers()
+            for token in tokens:
+                handler.send_chunk({"model": final["model"], "created_at": final["created_at"],
+                                    "response": token, "done": False})
+                time.sleep(delay)
+
+        # Same timing fields as Ollama, in nanoseconds
+        finished = time.perf_counter_ns()
+        final.update({
+            "total_duration": finished - started,
+            "load_duration": 0,
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": first_token - started,
+            "eval_count": len(tokens),
+            "eval_duration": finished - first_token,
+        })
+
+        if payload.get("stream", True):
+            handler.send_chunk(final)
+            handler.wfile.write(b"0\r\n\r\n")
+        else:
+            handler.send_json(200, final)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve canned Ollama responses.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--model", default="gemma3:4b", help="model name reported by /api/tags")
+    parser.add_argument("--script", help="JSON file of replies (list, or prompt substring to reply)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for generated replies and failures")
+    parser.add_argument("--ttft", type=float, default=0.0, help="seconds before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="token rate after the first (0 = instant)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of generate calls that fail")
+    parser.add_argument("--error-status", type=int, default=500, help="HTTP status of injected failures")
+    args = parser.parse_args()
+
+    script = None
+    if args.script:
+        with open(args.script, encoding="utf-8") as f:
+            script = json.load(f)
+
+    mock = MockOllama(args.host, args.port, args.model, script, args.seed, args.ttft, args.tokens_per_second,
+                      args.error_rate, args.error_status)
+    print(f"Mock Ollama listening on {mock.url}")
+    try:
+        mock.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
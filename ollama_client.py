@@ -0,0 +1,250 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from llm_cache import ResponseCache
+from llm_metrics import LLMMetrics
+
+# Next to the game like the font cache, not wherever it was started from
+DEFAULT_METRICS = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "llm_metrics.jsonl")
+
+class OllamaError(Exception):
+    pass
+
+
+class OllamaClient:
+    """Thin wrapper around the Ollama HTTP API.
+
+    All game code talks to the model through one instance of this class, so
+    the host, model, generation options, timeouts and retry policy live in a
+    single place. Requests go through a pooled keep-alive session, which saves
+    a TCP handshake per call and lets the worker threads share connections.
+
+    Settings default to the OLLAMA_* environment variables (a .env file works
+    too) and fall back to a local gemma3:4b. Setting OLLAMA_CACHE to a file
+    path turns on the persistent ResponseCache, capped at OLLAMA_CACHE_MAX_MB.
+    Every request asks Ollama to keep the model loaded for keep_alive
+    (OLLAMA_KEEP_ALIVE), so a player who takes a while to type does not pay
+    for reloading it. Each call's timings are recorded in self.metrics, and
+    appended to the OLLAMA_METRICS file when that is set. close() cuts off
+    any reply still streaming and makes later calls fail without a request.
+    """
+
+    def __init__(self, host=None, model=None, options=None, connect_timeout=None, read_timeout=None,
+                 max_retries=None, backoff_factor=0.5, pool_size=4, cache=None, keep_alive=None, metrics=None):
+        self.host = (host or os.getenv("OLLAMA_HOST", "http://localhost:11434")).rstrip("/")
+        self.model = model or os.getenv("OLLAMA_MODEL", "gemma3:4b")
+        self.options = dict(options or {})
+        # Every call uses the same context window; Ollama reloads the model when num_ctx changes
+        self.options.setdefault("num_ctx", int(os.getenv("OLLAMA_CONTEXT_TOKENS", "2048")))
+        if keep_alive is None:
+            keep_alive = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+        # Ollama takes a duration like "30m", or plain seconds as a number ("-1" keeps it loaded for good)
+        try:
+            keep_alive = int(keep_alive)
+        except ValueError:
+            pass
+        self.keep_alive = keep_alive
+        # Connect fails fast; the read timeout bounds the wait between bytes, so streams may run longer
+        self.timeout = (
+            connect_timeout if connect_timeout is not None else float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "3")),
+            read_timeout if read_timeout is not None else float(os.getenv("OLLAMA_READ_TIMEOUT", "120")),
+        )
+        if max_retries is None:
+            max_retries = int(os.getenv("OLLAMA_MAX_RETRIES", "2"))
+
+        # Only connection failures and 5xx answers are retried: a read timeout means
+        # the server took the request, and resending it would queue the same generation again
+        retry = Retry(
+            total=max_retries,
+            read=0,
+            backoff_factor=backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        if cache is None and os.getenv("OLLAMA_CACHE"):
+            max_bytes = int(float(os.getenv("OLLAMA_CACHE_MAX_MB", "64")) * 1024 * 1024)
+            cache = ResponseCache(os.getenv("OLLAMA_CACHE"), max_bytes)
+        self.cache = cache
+
+        if metrics is None:
+            metrics = LLMMetrics(os.getenv("OLLAMA_METRICS", DEFAULT_METRICS))
+        self.metrics = metrics
+
+        self.closed = False
+        self.streams = set()  # Streamed responses still being read, closed by close()
+        self.lock = threading.Lock()
+
+    def url(self, path):
+        return f"{self.host}{path}"
+
+    def build_payload(self, prompt, params):
+        payload = {"model": self.model, "prompt": prompt}
+        if self.keep_alive != "":
+            payload["keep_alive"] = self.keep_alive
+        if self.options or "options" in params:
+            payload["options"] = {**self.options, **params.pop("options", {})}
+        payload.update(params)
+        return payload
+
+    def generate(self, prompt, on_token=None, purpose=None, **params):
+        """Run /api/generate and return Ollama's final response object.
+
+        With on_token set the reply is streamed and on_token is called with
+        each token as it arrives; the returned object is the final "done"
+        chunk with "response" holding the full text either way. Extra keyword
+        arguments are sent as top-level request fields. Cached responses are
+        returned without contacting the server, with on_token called once
+        with the whole reply. purpose tags the call in self.metrics.
+        """
+        if self.closed:
+            raise OllamaError("Ollama client is closed")
+        payload = self.build_payload(prompt, params)
+        payload["stream"] = on_token is not None
+        started = time.perf_counter()
+
+        cached = None
+        if self.cache is not None:
+            try:
+                cached = self.cache.get(payload)
+            except sqlite3.Error as e:
+                print(f"Could not read LLM cache: {str(e)}")  # Debug logging
+            if cached is not None:
+                if on_token is not None and cached.get("response"):
+                    on_token(cached["response"])
+                self.metrics.record(purpose, self.model, time.perf_counter() - started, cached=True)
+                return cached
+
+        first_token = None
+        if on_token is not None:
+            stream_to = on_token
+
+            def on_token(token):
+                nonlocal first_token
+                if first_token is None:
+                    first_token = time.perf_counter() - started
+                stream_to(token)
+
+        try:
+            result = self.request(payload, on_token)
+        except Exception as e:
+            self.metrics.record(purpose, self.model, time.perf_counter() - started, first_token=first_token, error=e)
+            raise
+        self.metrics.record(purpose, self.model, time.perf_counter() - started, result, first_token)
+
+        if self.cache is not None:
+            # The call itself succeeded; a locked or full cache only costs the next hit
+            try:
+                self.cache.put(payload, result)
+            except (sqlite3.Error, OSError) as e:
+                print(f"Could not write LLM cache: {str(e)}")  # Debug logging
+        return result
+
+    def request(self, payload, on_token):
+        response = self.session.post(self.url("/api/generate"), json=payload, timeout=self.timeout,
+                                     stream=on_token is not None)
+        if on_token is None:
+            data = self.check(response).json()
+            if "error" in data:
+                raise OllamaError(data["error"])
+            return data
+
+        # Ollama streams one JSON object per line
+        self.check(response)
+        with self.lock:
+            if self.closed:
+                response.close()
+                raise OllamaError("Ollama client is closed")
+            self.streams.add(response)
+        tokens = []
+        final = {}
+        try:
+            with response:
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if "error" in chunk:
+                        raise OllamaError(chunk["error"])
+                    token = chunk.get("response", "")
+                    if token:
+                        tokens.append(token)
+                        on_token(token)
+                    if chunk.get("done"):
+                        final = chunk
+                        break
+        except Exception as e:
+            if self.closed:
+                # close() shut the stream from another thread; the read fails in whatever way it happened to be
+                raise OllamaError("Ollama client closed during the reply") from e
+            raise
+        finally:
+            with self.lock:
+                self.streams.discard(response)
+        final["response"] = "".join(tokens)
+        return final
+
+    def models(self):
+        """Names of the models installed on the server, from /api/tags."""
+        response = self.session.get(self.url("/api/tags"), timeout=self.timeout)
+        return [model["name"] for model in self.check(response).json().get("models", [])]
+
+    def check_model(self):
+        """Raise OllamaError unless the server is reachable and has the configured model."""
+        try:
+            installed = self.models()
+        except requests.RequestException as e:
+            raise OllamaError(f"Cannot reach Ollama at {self.host}; is \"ollama serve\" running?") from e
+
+        # "gemma3" means "gemma3:latest"
+        wanted = self.model if ":" in self.model else f"{self.model}:latest"
+        if wanted not in installed and self.model not in installed:
+            raise OllamaError(f"Model {self.model} is not installed; run: ollama pull {self.model}")
+
+    def warm_up(self):
+        """Check the model is installed and load it into memory, so the first real call does not wait for it.
+
+        A generate request without a prompt only loads the model. Returns the seconds it took.
+        """
+        started = time.perf_counter()
+        self.check_model()
+        payload = {"model": self.model, "stream": False, "options": self.options}
+        if self.keep_alive != "":
+            payload["keep_alive"] = self.keep_alive
+        response = self.session.post(self.url("/api/generate"), json=payload, timeout=self.timeout)
+        data = self.check(response).json()
+        if "error" in data:
+            raise OllamaError(data["error"])
+        return time.perf_counter() - started
+
+    def check(self, response):
+        if response.ok:
+            return response
+        try:
+            message = response.json().get("error", response.reason)
+        except ValueError:
+            message = response.reason
+        raise OllamaError(f"Ollama returned {response.status_code}: {message}")
+
+    def close(self):
+        with self.lock:
+            self.closed = True
+            streams = list(self.streams)
+        for response in streams:
+            response.close()
+        self.session.close()
+        self.metrics.close()
+        if self.cache is not None:
+            self.cache.close()
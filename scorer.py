@@ -0,0 +1,169 @@
+import re
+import sys
+from collections import Counter
+
+from conversation_log import read_events
+
+POSITIVE_INDICATORS = ["compelling", "convincing", "good point", "makes sense", "i see", "you're right", "valid", "agree"]
+NEGATIVE_INDICATORS = ["doubt", "skeptical", "not sure", "unconvinced", "disagree", "but still", "however", "yet"]
+STRONG_INDICATORS = ["absolutely", "completely", "definitely", "totally", "fully", "strongly"]
+# Turn a positive indicator right after them into a negative one ("not convincing"),
+# and cancel a negative one ("don't doubt")
+NEGATORS = ["not", "never", "hardly", "isn't", "doesn't", "don't", "wasn't", "aren't"]
+# Neither strengthen nor negate, but let a negator reach past them ("not really convincing")
+INTENSIFIERS = ["very", "really", "quite", "so", "that", "too", "particularly", "especially", "entirely"]
+
+
+def trie_pattern(phrases):
+    """Regex alternation of phrases with shared prefixes factored out.
+
+    Python's re tries alternatives one by one, so nesting them by common
+    prefix means each position is rejected after a character or two instead
+    of after every phrase. A space in a phrase matches any run of whitespace.
+    """
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [(r"\s+" if char == " " else re.escape(char)) + build(child)
+                    for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        pattern = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # A phrase may end here, or continue into a longer one
+            pattern = "(?:" + pattern + ")?"
+        return pattern
+
+    return build(trie)
+
+
+class ConvictionScorer:
+    """Scores how far an AI reply moves toward agreeing with the player.
+
+    All indicator phrases are compiled into one regex, matched on whole
+    words in a single pass, so "agree" no longer fires inside "disagree" or
+    "yet" inside "yesterday". Strong words, negators and intensifiers in a
+    row, separated only by whitespace, apply to the indicator right after
+    them. Each indicator counts once however often it appears. A positive
+    one counts for the player if any occurrence is free of negators, times
+    strong_factor for every distinct strong word before the strongest such
+    occurrence, and against when every occurrence is negated. A negative one
+    counts against unless every occurrence is negated; a negated doubt
+    ("I don't doubt it") is taken as neutral, not as agreement.
+    score() is from the point of view of convincing the AI something is true;
+    change() flips it for the FALSE goal, so both directions share one path.
+    """
+
+    def __init__(self, positive=POSITIVE_INDICATORS, negative=NEGATIVE_INDICATORS, strong=STRONG_INDICATORS,
+                 negators=NEGATORS, intensifiers=INTENSIFIERS, positive_weight=10, negative_weight=5,
+                 strong_factor=1.5):
+        self.positive = set(positive)
+        self.negative = set(negative)
+        self.strong = set(strong)
+        self.negators = set(negators)
+        self.positive_weight = positive_weight
+        self.negative_weight = negative_weight
+        self.strong_factor = strong_factor
+        self.modifiers = self.strong | self.negators | set(intensifiers)
+        self.phrases = self.positive | self.negative | self.modifiers
+        self.pattern = re.compile(r"\b{}\b".format(trie_pattern(self.phrases)))
+
+    def matches(self, text):
+        """Return {indicator: [set of modifiers in the run right before it, per occurrence]} for text."""
+        text = text.lower().replace("’", "'")
+        found = {}
+        run = set()
+        run_end = -1
+        for match in self.pattern.finditer(text):
+            phrase = match.group()
+            if phrase not in self.phrases:
+                phrase = " ".join(phrase.split())  # Matched across a newline or several spaces
+            # Only whitespace may separate the words of a run, and the run from its indicator
+            adjacent = run_end >= 0 and not text[run_end:match.start()].strip()
+            if phrase in self.modifiers:
+                if not adjacent:
+                    run = set()
+                run.add(phrase)
+                run_end = match.end()
+                continue
+
+            found.setdefault(phrase, []).append(run if adjacent else set())
+            run = set()
+            run_end = -1
+        return found
+
+    def score(self, text):
+        """Conviction score of a reply toward TRUE.
+
+        >>> scorer.score("That is totally convincing")
+        15.0
+        >>> scorer.score("That is not totally convincing")
+        -5
+        >>> scorer.score("not very convincing"), scorer.score("not really convincing")
+        (-5, -5)
+        >>> scorer.score("I disagree"), scorer.score("Yesterday I was there")
+        (-5, 0)
+        >>> scorer.score("Your first point is convincing, but the second is not convincing")
+        10.0
+        >>> scorer.score("I agree. I do not agree with the rest")
+        10.0
+        >>> scorer.score("I agree. I totally agree")
+        15.0
+        >>> scorer.score("I don't doubt it"), scorer.score("I never disagree"), scorer.score("I doubt it")
+        (0, 0, -5)
+        """
+        score = 0
+        for indicator, occurrences in self.matches(text).items():
+            plain = [modifiers for modifiers in occurrences if not modifiers & self.negators]
+            if indicator in self.negative:
+                if plain:
+                    score -= self.negative_weight
+            elif plain:
+                score += self.positive_weight * self.strong_factor ** max(len(m & self.strong) for m in plain)
+            else:
+                score -= self.negative_weight
+        return score
+
+    def change(self, text, convince_true):
+        """Conviction change for a reply, before the game's momentum adjustments."""
+        score = self.score(text)
+        return score if convince_true else -score
+
+    def score_transcript(self, events):
+        """Score every AI message in a conversation log. Returns (per-message scores, indicator counts)."""
+        scores = []
+        counts = Counter()
+        for event in events:
+            if event.get("event") != "message" or event.get("role") != "ai":
+                continue
+            scores.append(self.score(event["text"]))
+            counts.update(self.matches(event["text"]).keys())
+        return scores, counts
+
+
+scorer = ConvictionScorer()
+
+
+def score_transcripts(paths, scorer=scorer):
+    """Batch-score saved conversation logs; returns {path: (scores, indicator counts)}."""
+    return {path: scorer.score_transcript(read_events(path)) for path in paths}
+
+
+if __name__ == "__main__":
+    # Indicator statistics across saved games, for tuning: python scorer.py conversations/*.jsonl
+    results = score_transcripts(sys.argv[1:])
+    totals = Counter()
+    messages = 0
+    for path, (scores, counts) in results.items():
+        totals.update(counts)
+        messages += len(scores)
+        mean = sum(scores) / len(scores) if scores else 0
+        print(f"{path}: {len(scores)} replies, total {sum(scores):+.1f}, mean {mean:+.1f}")
+    print(f"{len(results)} transcripts, {messages} replies")
+    for indicator, count in totals.most_common():
+        print(f"  {indicator}: {count}")
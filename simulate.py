@@ -0,0 +1,133 @@
+"""Run AI-vs-AI debates headlessly and report how fast they go.
+
+Each game is the same loop as pressing Auto every turn in the window: the
+auto-player argues, the AI replies and conviction moves, until the debate is
+decided or the responses run out. Games run in a process pool and never touch
+pygame.
+
+    python3 simulate.py --games 20 --workers 4 --output results.jsonl
+"""
+import argparse
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from dotenv import load_dotenv
+
+# debate reads its settings when it is imported, so the .env file goes first
+load_dotenv()
+
+from debate import Debate, generate_reply, generate_scenario
+from ollama_client import OllamaClient, OllamaError
+
+# One client per worker process, created by init_worker
+client = None
+
+
+def init_worker():
+    global client
+    client = OllamaClient()
+
+
+def play_game(index, convince_true, seed):
+    random.seed(seed)
+    started = time.perf_counter()
+    debate = Debate(convince_true)
+    debate.current_scenario = generate_scenario(client)
+
+    turns = 0
+    errors = 0
+    decided = False
+    while not decided:
+        if debate.response_count >= debate.MAX_RESPONSES:
+            debate.ending()
+            break
+
+        try:
+            argument = client.generate(debate.automated_prompt(), purpose="auto-player")['response']
+        except Exception:
+            argument = debate.fallback_automated_response()
+            errors += 1
+
+        turn = debate.begin_turn(argument)
+        turns += 1
+        try:
+            decided = debate.apply_reply(generate_reply(client, *turn, session=debate.session))
+        except Exception:
+            debate.complete_history.append("AI: Error connecting to AI model")
+            errors += 1
+
+    return {
+        "game": index,
+        "goal": "TRUE" if convince_true else "FALSE",
+        "scenario": debate.current_scenario,
+        "won": debate.won,
+        "conviction": debate.conviction,
+        "turns": turns,
+        "errors": errors,
+        "seconds": round(time.perf_counter() - started, 3),
+        "transcript": debate.complete_history,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless AI-vs-AI debates.")
+    parser.add_argument("--games", type=int, default=10, help="number of games to play")
+    parser.add_argument("--workers", type=int, default=4, help="games played at once")
+    parser.add_argument("--side", choices=("true", "false", "random"), default="random",
+                        help="what the auto-player argues for")
+    parser.add_argument("--seed", type=int, default=None, help="seed for sides, personalities and fallbacks")
+    parser.add_argument("--output", help="write one JSON object per game, then a summary, to this file")
+    args = parser.parse_args()
+
+    # Fail before starting the pool if the model is missing, and load it once for every worker
+    client = OllamaClient()
+    try:
+        client.warm_up()
+    except OllamaError as e:
+        parser.exit(1, f"{e}\n")
+    finally:
+        client.close()
+
+    rng = random.Random(args.seed)
+    games = []
+    for index in range(args.games):
+        convince_true = rng.random() < 0.5 if args.side == "random" else args.side == "true"
+        games.append((index, convince_true, rng.randrange(2 ** 32)))
+
+    results = []
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker) as pool:
+        futures = [pool.submit(play_game, *game) for game in games]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            print(f"Game {result['game']}: {'won' if result['won'] else 'lost'} arguing {result['goal']} "
+                  f"in {result['turns']} turns, conviction {result['conviction']:.0f}%, "
+                  f"{result['seconds']:.1f}s ({result['scenario']})")
+    elapsed = time.perf_counter() - started
+
+    turns = sum(result["turns"] for result in results)
+    summary = {
+        "games": len(results),
+        "wins": sum(result["won"] for result in results),
+        "turns": turns,
+        "errors": sum(result["errors"] for result in results),
+        "workers": args.workers,
+        "seconds": round(elapsed, 3),
+        "games_per_minute": round(len(results) / elapsed * 60, 2),
+        "turns_per_second": round(turns / elapsed, 3),
+    }
+    print(f"{summary['games']} games ({summary['wins']} won), {summary['turns']} turns in {elapsed:.1f}s: "
+          f"{summary['games_per_minute']} games/min, {summary['turns_per_second']} turns/s")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for result in sorted(results, key=lambda result: result["game"]):
+                f.write(json.dumps(result, ensure_ascii=False) + "\n")
+            f.write(json.dumps({"summary": summary}) + "\n")
+
+
+if __name__ == "__main__":
+    main()